@@ -5,11 +5,29 @@ import os
 import xxhash
 from dataclasses import dataclass
 from typing import Optional, List, Dict, Any
+from tenacity import (
+    retry,
+    stop_after_attempt,
+    wait_exponential,
+    wait_random,
+    retry_if_exception,
+)
 
 from ..base import BaseVectorStorage
 from .._utils import logger, ensure_dependency
 
 
+def _is_transient_qdrant_error(error: BaseException) -> bool:
+    """Retry on connection failures and 429/5xx responses from Qdrant."""
+    from qdrant_client.http.exceptions import ResponseHandlingException, UnexpectedResponse
+
+    if isinstance(error, ResponseHandlingException):
+        return True
+    if isinstance(error, UnexpectedResponse):
+        return error.status_code in (429, 500, 502, 503, 504)
+    return False
+
+
 @dataclass
 class QdrantVectorStorage(BaseVectorStorage):
     """Qdrant vector storage backend using AsyncQdrantClient."""
@@ -64,6 +82,7 @@ class QdrantVectorStorage(BaseVectorStorage):
             self._hybrid_config = HybridSearchConfig.from_env()
 
         self._enable_hybrid = self._hybrid_config.enabled
+        self._sparse_provider = None
 
         logger.info(f"Initialized Qdrant storage for namespace: {self.namespace}")
     
@@ -76,6 +95,27 @@ class QdrantVectorStorage(BaseVectorStorage):
             )
         return self._client
     
+    def _get_sparse_provider(self):
+        """Get or create the sparse embedding provider (reuses its HTTP connection pool)."""
+        if self._sparse_provider is None:
+            from ..llm.providers.sparse import SparseEmbeddingProvider
+            self._sparse_provider = SparseEmbeddingProvider(config=self._hybrid_config)
+        return self._sparse_provider
+
+    @retry(
+        stop=stop_after_attempt(3),
+        wait=wait_exponential(multiplier=1, min=1, max=10) + wait_random(0, 1),
+        retry=retry_if_exception(_is_transient_qdrant_error),
+        reraise=True,
+    )
+    async def _upsert_batch(self, client, batch):
+        """Upsert one batch of points, retrying transient failures (point IDs are deterministic)."""
+        await client.upsert(
+            collection_name=self.namespace,
+            points=batch,
+            wait=True  # Ensure consistency
+        )
+
     async def _ensure_collection(self):
         """Ensure collection exists with proper configuration."""
         if self._collection_initialized:
@@ -166,8 +206,7 @@ class QdrantVectorStorage(BaseVectorStorage):
         sparse_name_embeddings = None
         if self._enable_hybrid:
             logger.info(f"[POINT-TRACK] Hybrid search enabled, generating sparse embeddings for {len(data)} entities")
-            from ..llm.providers.sparse import SparseEmbeddingProvider
-            provider = SparseEmbeddingProvider(config=self._hybrid_config)
+            provider = self._get_sparse_provider()
             all_contents = [d.get("content", "") for d in data.values()]
 
             try:
@@ -261,11 +300,7 @@ class QdrantVectorStorage(BaseVectorStorage):
 
             client = await self._get_client()
             try:
-                await client.upsert(
-                    collection_name=self.namespace,
-                    points=batch,
-                    wait=True  # Ensure consistency
-                )
+                await self._upsert_batch(client, batch)
                 logger.debug(f"[POINT-TRACK] Batch {batch_num}/{total_batches}: SUCCESS")
             except Exception as e:
                 logger.error(f"[POINT-TRACK] Batch {batch_num}/{total_batches}: FAILED - {type(e).__name__}: {e}")
@@ -331,8 +366,7 @@ class QdrantVectorStorage(BaseVectorStorage):
 
     async def _query_hybrid(self, client, query: str, query_embedding: list, top_k: int):
         """Execute hybrid search with sparse and dense vectors."""
-        from ..llm.providers.sparse import SparseEmbeddingProvider
-        provider = SparseEmbeddingProvider(config=self._hybrid_config)
+        provider = self._get_sparse_provider()
         sparse_result = await provider.embed([query])
         sparse_data = sparse_result[0]
 
@@ -433,6 +467,16 @@ class QdrantVectorStorage(BaseVectorStorage):
         )
         return formatted_results
     
+    async def check_health(self) -> bool:
+        """Probe Qdrant over the storage's pooled async client."""
+        try:
+            client = await self._get_client()
+            await client.get_collections()
+            return True
+        except Exception as e:
+            logger.warning(f"Qdrant health check failed: {e}")
+            return False
+
     async def index_done_callback(self):
         """Called when indexing is complete."""
         # Qdrant persists automatically, but we can force a sync if needed
@@ -446,4 +490,6 @@ class QdrantVectorStorage(BaseVectorStorage):
         """Async context manager exit - close client."""
         if hasattr(self, '_client'):
             if self._client:
-                await self._client.close()
\ No newline at end of file
+                await self._client.close()
+        if getattr(self, '_sparse_provider', None):
+            await self._sparse_provider.aclose()
\ No newline at end of file
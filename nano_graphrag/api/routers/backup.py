@@ -26,6 +26,11 @@ def get_backup_manager(graphrag: GraphRAG = Depends(get_graphrag)) -> BackupMana
     return BackupManager(graphrag, BACKUP_DIR)
 
 
+def get_job_manager(redis_client = Depends(get_redis)) -> JobManager:
+    """Dependency to get JobManager instance."""
+    return JobManager(redis_client)
+
+
 async def _create_backup_task(
     backup_manager: BackupManager,
     job_manager: JobManager,
@@ -65,14 +70,12 @@ async def create_backup(
     background_tasks: BackgroundTasks,
     graphrag: GraphRAG = Depends(get_graphrag),
     backup_manager: BackupManager = Depends(get_backup_manager),
-    redis_client = Depends(get_redis)
+    job_manager: JobManager = Depends(get_job_manager)
 ) -> JobResponse:
     """Create new backup asynchronously.
 
     Returns job ID for tracking backup progress.
     """
-    job_manager = JobManager(redis_client)
-
     # Create job
     job_id = await job_manager.create_job(
         job_type="backup",
@@ -147,7 +150,7 @@ async def restore_backup(
     file: UploadFile = File(...),
     background_tasks: BackgroundTasks = None,
     backup_manager: BackupManager = Depends(get_backup_manager),
-    redis_client = Depends(get_redis)
+    job_manager: JobManager = Depends(get_job_manager)
 ) -> JobResponse:
     """Restore from uploaded backup archive.
 
@@ -171,7 +174,6 @@ async def restore_backup(
     logger.info(f"Uploaded backup file: {backup_path} ({len(content):,} bytes)")
 
     # Create restore job
-    job_manager = JobManager(redis_client)
     job_id = await job_manager.create_job(
         job_type="restore",
         doc_ids=[],
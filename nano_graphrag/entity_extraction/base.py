@@ -115,21 +115,20 @@ class BaseEntityExtractor(ABC):
             batch_size: Number of chunks to process concurrently
 
         Returns:
-            List of extraction results
+            List of extraction results, in chunk order
         """
-        results = []
-        chunk_items = list(chunks.items())
-
-        for i in range(0, len(chunk_items), batch_size):
-            batch = chunk_items[i:i + batch_size]
-            batch_tasks = [
-                self.extract_single(chunk_data["content"], chunk_id=chunk_id)
-                for chunk_id, chunk_data in batch
-            ]
-            batch_results = await asyncio.gather(*batch_tasks)
-            results.extend(batch_results)
-
-        return results
+        # Sliding window rather than fixed batches: a slow chunk no longer
+        # holds back the rest of its batch
+        semaphore = asyncio.Semaphore(batch_size)
+
+        async def _bounded_extract(chunk_id: str, chunk_data: TextChunkSchema) -> ExtractionResult:
+            async with semaphore:
+                return await self.extract_single(chunk_data["content"], chunk_id=chunk_id)
+
+        return list(await asyncio.gather(*[
+            _bounded_extract(chunk_id, chunk_data)
+            for chunk_id, chunk_data in chunks.items()
+        ]))
 
     @staticmethod
     def deduplicate_entities(
@@ -3,7 +3,7 @@ import os
 import time
 from functools import partial
 from pathlib import Path
-from typing import Dict, List, Optional, Union, Any
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Union
 
 from .config import GraphRAGConfig
 from .llm.providers import get_llm_provider, get_embedding_provider
@@ -40,6 +40,10 @@ from .base import (
 )
 
 
+if TYPE_CHECKING:
+    from .entity_extraction.base import BaseEntityExtractor
+
+
 class GraphRAG:
     """GraphRAG with simplified configuration management."""
     
@@ -220,21 +224,26 @@ class GraphRAG:
 
     def _init_extractor(self):
         """Initialize entity extractor based on configuration."""
-        from nano_graphrag.entity_extraction.factory import create_extractor
-
-        self.entity_extractor = create_extractor(
-            strategy=self.config.entity_extraction.strategy,
-            model_func=self.best_model_func,
-            model_name=self.config.llm.model,
-            entity_types=self.config.entity_extraction.entity_types,
-            max_gleaning=self.config.entity_extraction.max_gleaning,
-            max_continuation_attempts=self.config.entity_extraction.max_continuation_attempts,
-            summary_max_tokens=self.config.entity_extraction.summary_max_tokens
-        )
+        self.entity_extractor = self._build_entity_extractor(self.config, self.best_model_func)
 
         # Keep compatibility with legacy extraction function
         self.entity_extraction_func = self._extract_entities_wrapper
 
+    @staticmethod
+    def _build_entity_extractor(config: GraphRAGConfig, model_func: Callable) -> "BaseEntityExtractor":
+        """Build the configured entity extractor without booting storage or providers."""
+        from nano_graphrag.entity_extraction.factory import create_extractor
+
+        return create_extractor(
+            strategy=config.entity_extraction.strategy,
+            model_func=model_func,
+            model_name=config.llm.model,
+            entity_types=config.entity_extraction.entity_types,
+            max_gleaning=config.entity_extraction.max_gleaning,
+            max_continuation_attempts=config.entity_extraction.max_continuation_attempts,
+            summary_max_tokens=config.entity_extraction.summary_max_tokens
+        )
+
     async def _extract_entities_wrapper(
         self,
         chunks: Dict[str, Any],
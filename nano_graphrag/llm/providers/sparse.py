@@ -9,11 +9,40 @@ from tenacity import (
     retry,
     stop_after_attempt,
     wait_exponential,
-    retry_if_exception_type,
+    wait_random,
+    retry_if_exception,
 )
 
 logger = logging.getLogger(__name__)
 
+MSGPACK_MEDIA_TYPE = "application/msgpack"
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+
+
+def _is_transient_error(error: BaseException) -> bool:
+    """Retry on network errors and 429/5xx responses, not on other client errors."""
+    import httpx
+
+    if isinstance(error, httpx.TransportError):
+        return True
+    if isinstance(error, httpx.HTTPStatusError):
+        return error.response.status_code in RETRY_STATUS_CODES
+    return False
+
+
+def _decode_msgpack_embeddings(content: bytes) -> List[Dict[str, Any]]:
+    """Decode the SPLADE service's MessagePack payload into indices/values lists."""
+    import msgpack
+    import numpy as np
+
+    return [
+        {
+            "indices": np.frombuffer(row["i"], dtype=np.int32).tolist(),
+            "values": np.frombuffer(row["v"], dtype=np.float32).tolist(),
+        }
+        for row in msgpack.unpackb(content, raw=False)
+    ]
+
 
 @dataclass
 class SparseEmbeddingProvider:
@@ -24,6 +53,18 @@ class SparseEmbeddingProvider:
     def __post_init__(self):
         """Initialize provider and check service configuration."""
         self._service_url = os.environ.get("SPARSE_SERVICE_URL")
+        self._wire_format = os.environ.get("SPARSE_WIRE_FORMAT", "json").lower()
+        self._client = None
+
+        if self._wire_format == "msgpack":
+            try:
+                import msgpack  # noqa: F401
+            except ImportError:
+                logger.error(
+                    "SPARSE_WIRE_FORMAT=msgpack requires the msgpack package "
+                    "(pip install nano-graphrag[hybrid]). Falling back to JSON."
+                )
+                self._wire_format = "json"
 
         if not self._service_url and self.config.enabled:
             logger.warning(
@@ -31,13 +72,35 @@ class SparseEmbeddingProvider:
                 "Sparse embeddings will return empty vectors."
             )
 
+    def _get_client(self):
+        """Get or create the pooled HTTP client reused across embed calls."""
+        if self._client is None:
+            import httpx
+
+            timeout = float(os.getenv("SPARSE_TIMEOUT_SECONDS", "60"))
+            self._client = httpx.AsyncClient(
+                timeout=timeout,
+                limits=httpx.Limits(max_keepalive_connections=32, max_connections=64)
+            )
+        return self._client
+
+    async def aclose(self):
+        """Close the pooled HTTP client."""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
     @retry(
         stop=stop_after_attempt(3),
-        wait=wait_exponential(multiplier=1, min=4, max=10),
-        retry=retry_if_exception_type((Exception,)),
+        wait=wait_exponential(multiplier=1, min=4, max=10) + wait_random(0, 2),
+        retry=retry_if_exception(_is_transient_error),
     )
     async def embed(self, texts: List[str]) -> List[Dict[str, Any]]:
-        """Generate sparse embeddings via external service with retry logic."""
+        """Generate sparse embeddings via external service with retry logic.
+
+        Transient failures are retried with jittered exponential backoff; tenacity
+        awaits asyncio.sleep between attempts so the event loop is never blocked.
+        """
         if not texts:
             return []
 
@@ -48,12 +111,18 @@ class SparseEmbeddingProvider:
             logger.debug("No SPARSE_SERVICE_URL configured, returning empty sparse vectors")
             return [{"indices": [], "values": []} for _ in texts]
 
-        import httpx
-
         logger.debug(f"Sending {len(texts)} texts to SPLADE service at {self._service_url}")
 
-        timeout = float(os.getenv("SPARSE_TIMEOUT_SECONDS", "60"))
-        async with httpx.AsyncClient(timeout=timeout) as client:
+        client = self._get_client()
+        if self._wire_format == "msgpack":
+            response = await client.post(
+                f"{self._service_url}/embed",
+                json={"texts": texts},
+                headers={"Accept": MSGPACK_MEDIA_TYPE}
+            )
+            response.raise_for_status()
+            embeddings = _decode_msgpack_embeddings(response.content)
+        else:
             response = await client.post(
                 f"{self._service_url}/embed",
                 json={"texts": texts}
@@ -62,12 +131,12 @@ class SparseEmbeddingProvider:
             result = response.json()
             embeddings = result["embeddings"]
 
-            if embeddings and logger.isEnabledFor(logging.DEBUG):
-                non_zeros = [len(emb["indices"]) for emb in embeddings]
-                avg_non_zeros = sum(non_zeros) / len(non_zeros) if non_zeros else 0
-                logger.debug(
-                    f"Sparse encoding via service: {len(texts)} texts, "
-                    f"avg {avg_non_zeros:.1f} non-zero dims"
-                )
+        if embeddings and logger.isEnabledFor(logging.DEBUG):
+            non_zeros = [len(emb["indices"]) for emb in embeddings]
+            avg_non_zeros = sum(non_zeros) / len(non_zeros) if non_zeros else 0
+            logger.debug(
+                f"Sparse encoding via service: {len(texts)} texts, "
+                f"avg {avg_non_zeros:.1f} non-zero dims"
+            )
 
-            return embeddings
\ No newline at end of file
+        return embeddings
\ No newline at end of file
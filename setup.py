@@ -52,11 +52,13 @@ setuptools.setup(
         "hybrid": [
             "transformers>=4.36.0",
             "torch>=2.0.0",
+            "msgpack>=1.0.0",
         ],
         "all": [
             "qdrant-client>=1.7.0",
             "transformers>=4.36.0",
             "torch>=2.0.0",
+            "msgpack>=1.0.0",
         ],
     },
 )
@@ -1,22 +1,66 @@
 """SPLADE Sparse Embedding Service - Separate microservice for sparse embeddings."""
 
+import asyncio
 import logging
-from typing import List, Dict, Any
-from fastapi import FastAPI, HTTPException
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Any, NamedTuple
+from fastapi import FastAPI, HTTPException, Request, Response
+from fastapi.responses import ORJSONResponse
 from pydantic import BaseModel
-import torch
-from transformers import AutoModelForMaskedLM, AutoTokenizer
+import numpy as np
+import orjson
+
+# Let the Rust tokenizer use all cores when encoding a batch (set before transformers loads)
+os.environ.setdefault("TOKENIZERS_PARALLELISM", "true")
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-app = FastAPI(title="SPLADE Embedding Service")
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+    logger.error("msgpack is not installed; msgpack requests will be answered with JSON")
+
+app = FastAPI(title="SPLADE Embedding Service", default_response_class=ORJSONResponse)
 
-# Global model storage
+# Global model storage. torch and transformers are imported by load_model so the
+# server can answer /health (with 503) before the heavy imports finish
+torch = None
 model = None
 tokenizer = None
 device = None
+compiled = False
+model_task = None
+
+# Sequence lengths are padded up to one of these buckets so the forward pass
+# only ever sees a handful of shapes (lets torch.compile reuse its graphs)
+LENGTH_BUCKETS = (32, 64, 128, 256)
+# With a compiled model, batches are likewise padded up to one of these row counts
+BATCH_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128)
+COMPILE_MODEL = os.getenv("SPLADE_COMPILE", "true").lower() == "true"
+
+MSGPACK_MEDIA_TYPE = "application/msgpack"
+
+# Returned for empty/whitespace-only texts, which never reach the model
+EMPTY_ROW = (np.empty(0, dtype=np.int32), np.empty(0, dtype=np.float32))
+
+# Concurrent /embed calls are coalesced into one forward pass: the batcher waits
+# up to COALESCE_WINDOW_MS for more requests, bounded by text count and UTF-8 size
+COALESCE_WINDOW_MS = float(os.getenv("SPLADE_COALESCE_WINDOW_MS", "8"))
+COALESCE_MAX_TEXTS = int(os.getenv("SPLADE_COALESCE_MAX_TEXTS", "128"))
+COALESCE_MAX_BYTES = 256 * 1024
+
+embed_queue = None
+batcher_task = None
+
+# Forward passes run on one dedicated thread so the event loop keeps accepting
+# requests, and compiled CUDA graphs are always replayed from the same thread
+inference_executor = ThreadPoolExecutor(max_workers=1)
+# Tokenization of the next batch overlaps the current batch's forward pass
+tokenize_executor = ThreadPoolExecutor(max_workers=1)
 
 
 class EmbedRequest(BaseModel):
@@ -24,6 +68,7 @@ class EmbedRequest(BaseModel):
     texts: List[str]
     max_length: int = 256
     batch_size: int = 32
+    top_k: int = 256
 
 
 class EmbedResponse(BaseModel):
@@ -31,23 +76,220 @@ class EmbedResponse(BaseModel):
     embeddings: List[Dict[str, List]]
 
 
-@app.on_event("startup")
-async def load_model():
-    """Load SPLADE model on startup."""
-    global model, tokenizer, device
+class NumpyORJSONResponse(ORJSONResponse):
+    """ORJSONResponse that serializes numpy arrays straight from their buffers."""
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, option=orjson.OPT_SERIALIZE_NUMPY)
+
+
+class PendingEmbed(NamedTuple):
+    """An /embed call waiting in the queue for the batcher."""
+    texts: List[str]
+    max_length: int
+    batch_size: int
+    top_k: int
+    future: asyncio.Future
+
+
+def pack_embeddings(rows: List[tuple]) -> bytes:
+    """Pack (indices, values) rows as MessagePack with raw int32/float32 buffers."""
+    return msgpack.packb(
+        [
+            {
+                "i": indices.astype(np.int32, copy=False).tobytes(),
+                "v": values.astype(np.float32, copy=False).tobytes()
+            }
+            for indices, values in rows
+        ],
+        use_bin_type=True
+    )
+
+
+def bucket_length(length: int, max_length: int) -> int:
+    """Round a sequence length up to the nearest bucket, capped at max_length."""
+    for bucket in LENGTH_BUCKETS:
+        if length <= bucket:
+            return min(bucket, max_length)
+    return max_length
+
+
+def bucket_batch_size(size: int) -> int:
+    """Round a batch size up to the nearest batch bucket."""
+    for bucket in BATCH_BUCKETS:
+        if size <= bucket:
+            return bucket
+    return size
+
+
+def tokenize_batch(batch_texts: List[str], max_length: int) -> Dict[str, Any]:
+    """Tokenize texts once, then right-pad to a bucketed length."""
+    encoded = tokenizer(
+        batch_texts,
+        max_length=max_length,
+        truncation=True,
+        padding="longest",
+        return_tensors="pt"
+    )
+    seq_len = encoded["input_ids"].shape[1]
+    extra = bucket_length(seq_len, max_length) - seq_len
+    if extra <= 0:
+        return dict(encoded)
+    return {
+        key: torch.nn.functional.pad(
+            tensor, (0, extra), value=tokenizer.pad_token_id if key == "input_ids" else 0
+        )
+        for key, tensor in encoded.items()
+    }
+
+
+def prepare_batch(batch_texts: List[str], max_length: int) -> Dict[str, Any]:
+    """Tokenize a batch on the host, pinning memory so the device copy can be async."""
+    if compiled:
+        # Filler rows keep the compiled graph on a warmed shape; encode_texts drops them
+        batch_texts = batch_texts + [""] * (bucket_batch_size(len(batch_texts)) - len(batch_texts))
+    inputs = tokenize_batch(batch_texts, max_length)
+    if device == "cuda":
+        return {key: tensor.pin_memory() for key, tensor in inputs.items()}
+    return dict(inputs)
+
+
+def encode_texts(texts: List[str], max_length: int, batch_size: int, top_k: int) -> List[tuple]:
+    """Run SPLADE over texts and return (indices, values) numpy rows."""
+    rows = []
+    batches = [texts[i:i + batch_size] for i in range(0, len(texts), batch_size)]
+
+    # Tokenize batch N+1 while the model runs batch N
+    next_inputs = tokenize_executor.submit(prepare_batch, batches[0], max_length)
+    for n, batch_texts in enumerate(batches):
+        host_inputs = next_inputs.result()
+        if n + 1 < len(batches):
+            next_inputs = tokenize_executor.submit(prepare_batch, batches[n + 1], max_length)
+
+        with torch.inference_mode():
+            inputs = {
+                key: tensor.to(device, non_blocking=True)
+                for key, tensor in host_inputs.items()
+            }
+
+            # Get model output
+            outputs = model(**inputs)
+
+            # ReLU then log(1 + x) for sparsity, masking out padding positions
+            mask = inputs["attention_mask"].unsqueeze(-1)
+            weights = torch.log1p(torch.relu(outputs.logits)) * mask
+
+            # Max pooling over sequence dimension
+            pooled = torch.max(weights, dim=1).values
+
+            # Keep the top-k dimensions per item on device, then copy once
+            k = min(top_k, pooled.shape[1])
+            values, indices = torch.topk(pooled, k=k, dim=1)
+            keep = (values > 0).cpu()
+            values = values.cpu()
+            indices = indices.to(torch.int32).cpu()
+
+            for j in range(len(batch_texts)):
+                row_keep = keep[j]
+                rows.append((indices[j][row_keep].numpy(), values[j][row_keep].numpy()))
+
+    return rows
+
+
+async def batcher():
+    """Coalesce queued /embed calls into shared forward passes."""
+    loop = asyncio.get_running_loop()
+    window = COALESCE_WINDOW_MS / 1000
+
+    while True:
+        pending = [await embed_queue.get()]
+        total_texts = len(pending[0].texts)
+        total_bytes = sum(len(t.encode()) for t in pending[0].texts)
+        deadline = loop.time() + window
+
+        while total_texts < COALESCE_MAX_TEXTS and total_bytes < COALESCE_MAX_BYTES:
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                break
+            try:
+                item = await asyncio.wait_for(embed_queue.get(), timeout=remaining)
+            except asyncio.TimeoutError:
+                break
+            pending.append(item)
+            total_texts += len(item.texts)
+            total_bytes += sum(len(t.encode()) for t in item.texts)
+
+        # Only requests with identical encoding parameters can share a forward pass
+        groups: Dict[tuple, List[PendingEmbed]] = {}
+        for item in pending:
+            groups.setdefault((item.max_length, item.batch_size, item.top_k), []).append(item)
+
+        for (max_length, batch_size, top_k), items in groups.items():
+            texts = [text for item in items for text in item.texts]
+            if len(items) > 1:
+                logger.info(f"Coalesced {len(items)} requests into one pass ({len(texts)} texts)")
+            try:
+                rows = await loop.run_in_executor(
+                    inference_executor, encode_texts, texts, max_length, batch_size, top_k
+                )
+            except Exception as e:
+                for item in items:
+                    if not item.future.done():
+                        item.future.set_exception(e)
+                continue
+
+            offset = 0
+            for item in items:
+                if not item.future.done():
+                    item.future.set_result(rows[offset:offset + len(item.texts)])
+                offset += len(item.texts)
+
+
+def load_model():
+    """Import torch/transformers and load the SPLADE model."""
+    global torch, model, tokenizer, device, compiled
 
     model_name = "prithivida/Splade_PP_en_v1"
     logger.info(f"Loading SPLADE model: {model_name}")
 
     try:
-        # Load model and tokenizer
-        tokenizer = AutoTokenizer.from_pretrained(model_name)
-        model = AutoModelForMaskedLM.from_pretrained(model_name)
+        import torch
+        from transformers import AutoModelForMaskedLM, AutoTokenizer
+
+        # Load model and tokenizer, preferring the cache baked into the image
+        # so restarts don't hit the HF hub
+        try:
+            loaded_tokenizer = AutoTokenizer.from_pretrained(model_name, use_fast=True, local_files_only=True)
+            loaded_model = AutoModelForMaskedLM.from_pretrained(model_name, local_files_only=True)
+        except OSError:
+            logger.info("Model not found in local cache, downloading from hub")
+            loaded_tokenizer = AutoTokenizer.from_pretrained(model_name, use_fast=True)
+            loaded_model = AutoModelForMaskedLM.from_pretrained(model_name)
 
         # Detect device
-        device = "cuda" if torch.cuda.is_available() else "cpu"
-        model = model.to(device)
-        model.eval()
+        loaded_device = "cuda" if torch.cuda.is_available() else "cpu"
+        loaded_model = loaded_model.to(loaded_device)
+        loaded_model.eval()
+
+        if COMPILE_MODEL and loaded_device == "cuda":
+            loaded_model = torch.compile(loaded_model, mode="reduce-overhead", fullgraph=False)
+            # Warm every (batch, length) bucket so the first real request doesn't pay for compilation
+            with torch.inference_mode():
+                for batch in BATCH_BUCKETS:
+                    for length in LENGTH_BUCKETS:
+                        dummy = loaded_tokenizer(
+                            ["warmup"] * batch,
+                            return_tensors="pt",
+                            max_length=length,
+                            padding="max_length"
+                        ).to(loaded_device)
+                        loaded_model(**dummy)
+            compiled = True
+            logger.info(f"Compiled model for batch buckets {BATCH_BUCKETS} and length buckets {LENGTH_BUCKETS}")
+
+        # Publish only once fully ready; /health and /embed key off `model`
+        tokenizer, device = loaded_tokenizer, loaded_device
+        model = loaded_model
 
         logger.info(f"Model loaded successfully on {device}")
         logger.info(f"Model parameters: {sum(p.numel() for p in model.parameters()) / 1e6:.1f}M")
@@ -56,6 +298,36 @@ async def load_model():
         raise
 
 
+async def load_model_in_background():
+    """Run load_model on the inference thread; failures leave /health at 503."""
+    try:
+        await asyncio.get_running_loop().run_in_executor(inference_executor, load_model)
+    except Exception:
+        pass  # Already logged by load_model
+
+
+@app.on_event("startup")
+async def start_model_loading():
+    """Start loading the model without blocking server startup."""
+    global model_task
+    model_task = asyncio.create_task(load_model_in_background())
+
+
+@app.on_event("startup")
+async def start_batcher():
+    """Start the request-coalescing batcher."""
+    global embed_queue, batcher_task
+    embed_queue = asyncio.Queue()
+    batcher_task = asyncio.create_task(batcher())
+
+
+@app.on_event("shutdown")
+async def stop_batcher():
+    """Stop the request-coalescing batcher."""
+    if batcher_task is not None:
+        batcher_task.cancel()
+
+
 @app.get("/health")
 async def health():
     """Health check endpoint."""
@@ -65,80 +337,56 @@ async def health():
 
 
 @app.post("/embed", response_model=EmbedResponse)
-async def embed(request: EmbedRequest):
-    """Generate sparse embeddings for texts."""
+async def embed(request: EmbedRequest, http_request: Request):
+    """Generate sparse embeddings for texts.
+
+    Clients sending ``Accept: application/msgpack`` get a binary payload instead of JSON.
+    JSON responses are built directly from the numpy rows, bypassing response_model
+    validation (EmbedResponse still documents the shape).
+    """
     if model is None:
         raise HTTPException(status_code=503, detail="Model not loaded")
 
     texts = request.texts
     max_length = request.max_length
     batch_size = request.batch_size
+    top_k = request.top_k
+    use_msgpack = msgpack is not None and MSGPACK_MEDIA_TYPE in http_request.headers.get("accept", "")
 
     if not texts:
-        return EmbedResponse(embeddings=[])
+        if use_msgpack:
+            return Response(content=pack_embeddings([]), media_type=MSGPACK_MEDIA_TYPE)
+        return NumpyORJSONResponse({"embeddings": []})
 
     logger.info(f"Encoding {len(texts)} texts")
 
     try:
-        sparse_embeddings = []
-
-        # Process in batches
-        for i in range(0, len(texts), batch_size):
-            batch_texts = texts[i:i + batch_size]
-
-            with torch.no_grad():
-                # Tokenize
-                inputs = tokenizer(
-                    batch_texts,
-                    return_tensors="pt",
-                    max_length=max_length,
-                    truncation=True,
-                    padding=True
-                ).to(device)
-
-                # Get model output
-                outputs = model(**inputs)
-                logits = outputs.logits
-
-                # Process each item in batch
-                for j in range(len(batch_texts)):
-                    item_logits = logits[j]
-
-                    # Max pooling over sequence dimension
-                    pooled = torch.max(item_logits, dim=0).values
-
-                    # Apply ReLU then log(1 + x) for sparsity
-                    sparse = torch.log1p(torch.relu(pooled))
-
-                    # Convert to sparse format (only non-zero values)
-                    nonzero = torch.nonzero(sparse).squeeze()
-
-                    if nonzero.numel() > 0:
-                        indices = nonzero.cpu().numpy().tolist()
-                        values = sparse[nonzero].cpu().numpy().tolist()
-
-                        # Ensure lists even for single values
-                        if isinstance(indices, int):
-                            indices = [indices]
-                            values = [values]
-                    else:
-                        indices = []
-                        values = []
-
-                    sparse_embeddings.append({
-                        "indices": indices,
-                        "values": values
-                    })
+        # Blank texts get an empty vector without taking a slot in a batch
+        keep = [i for i, text in enumerate(texts) if text and text.strip()]
+        rows = [EMPTY_ROW] * len(texts)
+
+        if keep:
+            future = asyncio.get_running_loop().create_future()
+            kept_texts = [texts[i] for i in keep]
+            await embed_queue.put(PendingEmbed(kept_texts, max_length, batch_size, top_k, future))
+            for i, row in zip(keep, await future):
+                rows[i] = row
 
         # Log statistics
-        non_zero_counts = [len(e["indices"]) for e in sparse_embeddings]
+        non_zero_counts = [len(row_indices) for row_indices, _ in rows]
         avg_non_zeros = sum(non_zero_counts) / len(non_zero_counts) if non_zero_counts else 0
         logger.info(
             f"Generated sparse embeddings: {len(texts)} texts, "
             f"avg {avg_non_zeros:.1f} non-zero dims"
         )
 
-        return EmbedResponse(embeddings=sparse_embeddings)
+        if use_msgpack:
+            return Response(content=pack_embeddings(rows), media_type=MSGPACK_MEDIA_TYPE)
+
+        return NumpyORJSONResponse({"embeddings": [
+            {"indices": row_indices, "values": row_values}
+            for row_indices, row_values in rows
+        ]})
 
     except Exception as e:
         logger.error(f"Embedding failed: {e}")
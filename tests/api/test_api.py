@@ -1,35 +1,43 @@
 """Tests for FastAPI REST API."""
 
+import asyncio
+import json
+
+import httpx
 import pytest
-from fastapi.testclient import TestClient
+import pytest_asyncio
 from unittest.mock import AsyncMock, MagicMock
 from fastapi import FastAPI
 
 from nano_graphrag.api.app import create_app
 from nano_graphrag.api.models import QueryMode
+from nano_graphrag.api.routers import documents, query, health, management
+from tests.utils import aret
+
+
+# Query bodies are serialized once at import and posted as raw content.
+_JSON_HEADERS = {"content-type": "application/json"}
+_LOCAL_QUERY = json.dumps({"question": "What is the meaning of life?", "mode": "local"}).encode()
+_GLOBAL_QUERY = json.dumps({"question": "What are the main themes?", "mode": "global"}).encode()
+_NAIVE_QUERY = json.dumps({"question": "Simple question", "mode": "naive"}).encode()
+_CONCURRENT_QUERIES = tuple(
+    json.dumps({"question": f"Query {i}", "mode": "local"}).encode() for i in range(10)
+)
 
 
 @pytest.fixture
 def mock_graphrag():
     """Create mock GraphRAG instance."""
     mock = MagicMock()
-    mock.ainsert = AsyncMock(return_value=None)
-    mock.aquery = AsyncMock(return_value="Test response")
-
-    # Mock storage backends
-    mock.full_docs = MagicMock()
-    mock.full_docs.get_by_id = AsyncMock(return_value={"content": "Test document"})
-    mock.full_docs.delete_by_id = AsyncMock(return_value=True)
-    mock.full_docs.drop = AsyncMock(return_value=None)
-
-    mock.text_chunks = MagicMock()
-    mock.community_reports = MagicMock()
-    mock.llm_response_cache = MagicMock()
-    mock.llm_response_cache.drop = AsyncMock(return_value=None)
-
-    mock.chunk_entity_relation_graph = MagicMock()
-    mock.entities_vdb = MagicMock()
-
+    mock.configure_mock(**{
+        "ainsert": AsyncMock(return_value=None),
+        "aquery": AsyncMock(return_value="Test response"),
+        # Storage backends
+        "full_docs.get_by_id": aret({"content": "Test document"}),
+        "full_docs.delete_by_id": aret(True),
+        "full_docs.drop": aret(None),
+        "llm_response_cache.drop": aret(None),
+    })
     return mock
 
 
@@ -37,35 +45,27 @@ def mock_graphrag():
 def mock_redis():
     """Create mock Redis client."""
     mock = MagicMock()
-    mock.ping = AsyncMock(return_value=True)
-    mock.set = AsyncMock(return_value=True)
-    mock.setex = AsyncMock(return_value=True)
-    mock.get = AsyncMock(return_value='{"job_id": "test-job", "status": "pending", "created_at": "2025-01-01T00:00:00", "doc_ids": ["doc-1", "doc-2", "doc-3"], "progress": {"current": 0, "total": 3, "phase": "initializing"}, "metadata": {}}')
-    mock.keys = AsyncMock(return_value=[])
-    mock.hset = AsyncMock(return_value=True)
-    mock.hget = AsyncMock(return_value=None)
-    mock.hgetall = AsyncMock(return_value={})
-    mock.zadd = AsyncMock(return_value=1)
-    mock.zrevrange = AsyncMock(return_value=[])
-    mock.sadd = AsyncMock(return_value=1)
-    mock.srem = AsyncMock(return_value=1)
-    mock.smembers = AsyncMock(return_value=set())
+    mock.ping = aret(True)
+    mock.set = aret(True)
+    mock.setex = aret(True)
+    mock.get = aret('{"job_id": "test-job", "status": "pending", "created_at": "2025-01-01T00:00:00", "doc_ids": ["doc-1", "doc-2", "doc-3"], "progress": {"current": 0, "total": 3, "phase": "initializing"}, "metadata": {}}')
+    mock.keys = aret([])
+    mock.hset = aret(True)
+    mock.hget = aret(None)
+    mock.hgetall = AsyncMock(return_value={})  # tests override return_value
+    mock.zadd = aret(1)
+    mock.zrevrange = aret([])
+    mock.sadd = aret(1)
+    mock.srem = aret(1)
+    mock.smembers = aret(set())
     return mock
 
 
-@pytest.fixture
-def test_app(mock_graphrag, mock_redis):
-    """Create test FastAPI app with mocked GraphRAG."""
+@pytest.fixture(scope="session")
+def test_app():
+    """Build the FastAPI app and register routers once for the whole session."""
     app = FastAPI()
 
-    # Import routers after creating app
-    from nano_graphrag.api.routers import documents, query, health, management
-    from nano_graphrag.api.config import settings
-
-    # Set GraphRAG and Redis in app state
-    app.state.graphrag = mock_graphrag
-    app.state.redis_client = mock_redis
-
     # Include routers
     app.include_router(documents.router, prefix="/api/v1")
     app.include_router(query.router, prefix="/api/v1")
@@ -75,15 +75,28 @@ def test_app(mock_graphrag, mock_redis):
     return app
 
 
-@pytest.fixture
-def client(test_app):
-    """Create test client."""
-    return TestClient(test_app)
+@pytest.fixture(autouse=True)
+def _wire_app_state(test_app, mock_graphrag, mock_redis):
+    """Point the shared app at this test's mocked GraphRAG and Redis."""
+    test_app.state.graphrag = mock_graphrag
+    test_app.state.redis_client = mock_redis
+    yield
+    del test_app.state.graphrag
+    del test_app.state.redis_client
 
 
-def test_document_insert(client: TestClient, mock_graphrag):
+@pytest_asyncio.fixture
+async def client(test_app):
+    """Create async test client bound to the app over ASGI (no portal thread)."""
+    transport = httpx.ASGITransport(app=test_app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as c:
+        yield c
+
+
+@pytest.mark.asyncio
+async def test_document_insert(client: httpx.AsyncClient, mock_graphrag):
     """Test document insertion endpoint."""
-    response = client.post(
+    response = await client.post(
         "/api/v1/documents",
         json={"content": "Test document content"}
     )
@@ -94,7 +107,8 @@ def test_document_insert(client: TestClient, mock_graphrag):
     assert data["message"] == "Document processed successfully"
 
 
-def test_batch_insert(client: TestClient, mock_graphrag, mock_redis):
+@pytest.mark.asyncio
+async def test_batch_insert(client: httpx.AsyncClient, mock_graphrag, mock_redis):
     """Test batch document insertion with native batch processing."""
     # Mock the job manager's responses
     job_id = "test-job-123"
@@ -107,7 +121,7 @@ def test_batch_insert(client: TestClient, mock_graphrag, mock_redis):
         "metadata": '{}'
     }
 
-    response = client.post(
+    response = await client.post(
         "/api/v1/documents/batch",
         json={
             "documents": [
@@ -133,11 +147,12 @@ def test_batch_insert(client: TestClient, mock_graphrag, mock_redis):
     # which isn't executed in the test environment
 
 
-def test_batch_insert_size_limit(client: TestClient, mock_graphrag, mock_redis):
+@pytest.mark.asyncio
+async def test_batch_insert_size_limit(client: httpx.AsyncClient, mock_graphrag, mock_redis):
     """Test that batch size limit is enforced."""
     documents = [{"content": f"Document {i}"} for i in range(101)]
 
-    response = client.post(
+    response = await client.post(
         "/api/v1/documents/batch",
         json={"documents": documents}
     )
@@ -149,15 +164,10 @@ def test_batch_insert_size_limit(client: TestClient, mock_graphrag, mock_redis):
     assert len(data["detail"]) > 0
 
 
-def test_query_local(client: TestClient, mock_graphrag):
+@pytest.mark.asyncio
+async def test_query_local(client: httpx.AsyncClient, mock_graphrag):
     """Test local query mode."""
-    response = client.post(
-        "/api/v1/query",
-        json={
-            "question": "What is the meaning of life?",
-            "mode": "local"
-        }
-    )
+    response = await client.post("/api/v1/query", content=_LOCAL_QUERY, headers=_JSON_HEADERS)
 
     assert response.status_code == 200
     data = response.json()
@@ -167,39 +177,30 @@ def test_query_local(client: TestClient, mock_graphrag):
     mock_graphrag.aquery.assert_called_once()
 
 
-def test_query_global(client: TestClient, mock_graphrag):
+@pytest.mark.asyncio
+async def test_query_global(client: httpx.AsyncClient, mock_graphrag):
     """Test global query mode."""
-    response = client.post(
-        "/api/v1/query",
-        json={
-            "question": "What are the main themes?",
-            "mode": "global"
-        }
-    )
+    response = await client.post("/api/v1/query", content=_GLOBAL_QUERY, headers=_JSON_HEADERS)
 
     assert response.status_code == 200
     data = response.json()
     assert data["mode"] == "global"
 
 
-def test_query_naive(client: TestClient, mock_graphrag):
+@pytest.mark.asyncio
+async def test_query_naive(client: httpx.AsyncClient, mock_graphrag):
     """Test naive query mode."""
-    response = client.post(
-        "/api/v1/query",
-        json={
-            "question": "Simple question",
-            "mode": "naive"
-        }
-    )
+    response = await client.post("/api/v1/query", content=_NAIVE_QUERY, headers=_JSON_HEADERS)
 
     assert response.status_code == 200
     data = response.json()
     assert data["mode"] == "naive"
 
 
-def test_get_document(client: TestClient, mock_graphrag):
+@pytest.mark.asyncio
+async def test_get_document(client: httpx.AsyncClient, mock_graphrag):
     """Test document retrieval."""
-    response = client.get("/api/v1/documents/test_id")
+    response = await client.get("/api/v1/documents/test_id")
 
     assert response.status_code == 200
     data = response.json()
@@ -207,30 +208,44 @@ def test_get_document(client: TestClient, mock_graphrag):
     assert "content" in data
 
 
-def test_delete_document(client: TestClient, mock_graphrag):
+@pytest.mark.asyncio
+async def test_delete_document(client: httpx.AsyncClient, mock_graphrag):
     """Test document deletion."""
-    response = client.delete("/api/v1/documents/test_id")
+    response = await client.delete("/api/v1/documents/test_id")
 
     assert response.status_code == 200
     data = response.json()
     assert "deleted" in data["message"]
 
 
-def test_health_check(client: TestClient):
-    """Test health check endpoint."""
-    response = client.get("/api/v1/health")
+@pytest.mark.asyncio
+@pytest.mark.parametrize("path, required_keys, check", [
+    ("/api/v1/health", {"status", "neo4j", "qdrant", "redis"}, None),
+    ("/api/v1/health/live", {"status"}, lambda data: data["status"] == "alive"),
+    ("/api/v1/info", {"nano_graphrag_version", "backends", "llm"}, None),
+    ("/api/v1/stats", set(), None),
+    (
+        "/api/v1/query/modes",
+        {"modes"},
+        lambda data: {m["name"] for m in data["modes"]} == {"local", "global", "naive"},
+    ),
+])
+async def test_get_endpoints(client: httpx.AsyncClient, path, required_keys, check):
+    """Test the read-only health, info, stats and query-modes endpoints."""
+    response = await client.get(path)
 
     assert response.status_code == 200
     data = response.json()
-    assert "status" in data
-    assert "neo4j" in data
-    assert "qdrant" in data
-    assert "redis" in data
+    assert isinstance(data, dict)
+    assert required_keys.issubset(data)
+    if check is not None:
+        assert check(data)
 
 
-def test_readiness_probe(client: TestClient):
+@pytest.mark.asyncio
+async def test_readiness_probe(client: httpx.AsyncClient):
     """Test readiness probe."""
-    response = client.get("/api/v1/health/ready")
+    response = await client.get("/api/v1/health/ready")
 
     # Backends aren't mocked with health checks, so we expect 503
     if response.status_code == 503:
@@ -241,67 +256,37 @@ def test_readiness_probe(client: TestClient):
         assert data["status"] == "ready"
 
 
-def test_liveness_probe(client: TestClient):
-    """Test liveness probe."""
-    response = client.get("/api/v1/health/live")
-
-    assert response.status_code == 200
-    data = response.json()
-    assert data["status"] == "alive"
-
-
-def test_get_info(client: TestClient):
-    """Test system information endpoint."""
-    response = client.get("/api/v1/info")
-
-    assert response.status_code == 200
-    data = response.json()
-    assert "nano_graphrag_version" in data
-    assert "backends" in data
-    assert "llm" in data
-
-
-def test_get_stats(client: TestClient):
-    """Test statistics endpoint."""
-    response = client.get("/api/v1/stats")
-
-    assert response.status_code == 200
-    data = response.json()
-    assert isinstance(data, dict)
-
-
-def test_clear_cache(client: TestClient, mock_graphrag):
+@pytest.mark.asyncio
+async def test_clear_cache(client: httpx.AsyncClient, mock_graphrag):
     """Test cache clearing."""
-    response = client.post("/api/v1/cache/clear")
+    response = await client.post("/api/v1/cache/clear")
 
     assert response.status_code == 200
     data = response.json()
     assert "message" in data
 
 
-def test_query_modes(client: TestClient):
-    """Test query modes listing."""
-    response = client.get("/api/v1/query/modes")
-
-    assert response.status_code == 200
-    data = response.json()
-    assert "modes" in data
-    assert len(data["modes"]) == 3
-    mode_names = [m["name"] for m in data["modes"]]
-    assert "local" in mode_names
-    assert "global" in mode_names
-    assert "naive" in mode_names
-
+@pytest.mark.asyncio
+async def test_concurrent_queries(client: httpx.AsyncClient, mock_graphrag):
+    """Test that concurrent queries are served concurrently on the event loop."""
+    in_flight = 0
+    peak_in_flight = 0
 
-def test_concurrent_queries(client: TestClient, mock_graphrag):
-    """Test handling of concurrent queries."""
-    from concurrent.futures import ThreadPoolExecutor
+    async def tracked_query(*args, **kwargs):
+        nonlocal in_flight, peak_in_flight
+        in_flight += 1
+        peak_in_flight = max(peak_in_flight, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return "Test response"
 
-    def make_request(i):
-        return client.post("/api/v1/query", json={"question": f"Query {i}", "mode": "local"})
+    mock_graphrag.aquery.side_effect = tracked_query
 
-    with ThreadPoolExecutor(max_workers=10) as executor:
-        responses = list(executor.map(make_request, range(10)))
+    responses = await asyncio.gather(*(
+        client.post("/api/v1/query", content=body, headers=_JSON_HEADERS)
+        for body in _CONCURRENT_QUERIES
+    ))
 
     assert all(r.status_code == 200 for r in responses)
-    assert mock_graphrag.aquery.call_count == 10
\ No newline at end of file
+    assert mock_graphrag.aquery.call_count == 10
+    assert peak_in_flight > 1
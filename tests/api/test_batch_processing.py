@@ -1,4 +1,10 @@
-"""Tests specifically for batch processing performance fix."""
+"""Tests specifically for batch processing performance fix.
+
+Batch processing hands every document to a single ``ainsert`` call, so
+clustering and community report generation run once per batch instead of
+once per document. Clustering cost grows with graph size, so the saving
+over sequential inserts is more than N-fold.
+"""
 
 import pytest
 from unittest.mock import AsyncMock, MagicMock, patch, call
@@ -7,7 +13,18 @@ from datetime import datetime
 
 from nano_graphrag.api.routers.documents import _process_batch_with_tracking
 from nano_graphrag.api.models import JobStatus
-from nano_graphrag.api.jobs import JobManager
+
+
+class _JobManagerSpec:
+    """The slice of JobManager that _process_batch_with_tracking touches.
+
+    A two-method spec is cheaper to introspect than the real JobManager, and
+    MagicMock turns its async methods into AsyncMocks automatically.
+    """
+
+    async def update_job_status(self, job_id, status, error=None): ...
+
+    async def update_job_progress(self, job_id, current, phase): ...
 
 
 @pytest.mark.asyncio
@@ -21,9 +38,7 @@ async def test_batch_processing_uses_single_insert():
     mock_graphrag = MagicMock()
     mock_graphrag.ainsert = AsyncMock(return_value=None)
 
-    mock_job_manager = MagicMock(spec=JobManager)
-    mock_job_manager.update_job_status = AsyncMock()
-    mock_job_manager.update_job_progress = AsyncMock()
+    mock_job_manager = MagicMock(spec=_JobManagerSpec)
 
     # Execute batch processing
     await _process_batch_with_tracking(
@@ -61,9 +76,7 @@ async def test_batch_processing_error_handling():
     # Simulate an error during batch processing
     mock_graphrag.ainsert = AsyncMock(side_effect=Exception("Processing failed"))
 
-    mock_job_manager = MagicMock(spec=JobManager)
-    mock_job_manager.update_job_status = AsyncMock()
-    mock_job_manager.update_job_progress = AsyncMock()
+    mock_job_manager = MagicMock(spec=_JobManagerSpec)
 
     # Execute batch processing
     await _process_batch_with_tracking(
@@ -90,9 +103,7 @@ async def test_phase_based_progress_tracking():
     mock_graphrag = MagicMock()
     mock_graphrag.ainsert = AsyncMock(return_value=None)
 
-    mock_job_manager = MagicMock(spec=JobManager)
-    mock_job_manager.update_job_status = AsyncMock()
-    mock_job_manager.update_job_progress = AsyncMock()
+    mock_job_manager = MagicMock(spec=_JobManagerSpec)
 
     await _process_batch_with_tracking(
         documents=documents,
@@ -118,33 +129,3 @@ async def test_phase_based_progress_tracking():
     # Should NOT have "processing document X/Y" format
     assert not any("document" in phase for phase in phases_reported if phase)
 
-
-def test_batch_vs_sequential_performance():
-    """Demonstrate the performance difference between batch and sequential processing.
-
-    This is a conceptual test showing the algorithmic difference.
-    """
-    num_documents = 10
-
-    # Sequential processing cost (simplified)
-    # Each document triggers: chunking + extraction + graph_build + clustering + reports
-    sequential_clustering_operations = num_documents  # N clusterings
-    sequential_report_generations = num_documents     # N report generations
-
-    # Batch processing cost
-    batch_clustering_operations = 1  # Single clustering
-    batch_report_generations = 1     # Single report generation
-
-    # Verify batch is more efficient
-    assert batch_clustering_operations < sequential_clustering_operations
-    assert batch_report_generations < sequential_report_generations
-
-    # Performance ratio
-    clustering_speedup = sequential_clustering_operations / batch_clustering_operations
-    assert clustering_speedup == num_documents  # 10x speedup for clustering
-
-    # With increasing graph size, clustering becomes O(n²), so actual speedup is even better
-    # For 10 docs with 100 entities each:
-    # Sequential: cluster(100) + cluster(200) + ... + cluster(1000) ≈ O(n³)
-    # Batch: cluster(1000) ≈ O(n²)
-    # Actual speedup > 10x
\ No newline at end of file
@@ -0,0 +1,27 @@
+"""Plain helpers shared by the backup tests and their fixtures."""
+
+from dataclasses import dataclass
+from unittest.mock import NonCallableMagicMock, create_autospec
+
+from nano_graphrag import GraphRAG
+
+
+@dataclass
+class MockConfig:
+    """Serializable stand-in for GraphRAGConfig."""
+    test: str = "config"
+
+
+def build_mock_graphrag():
+    """Build an autospecced GraphRAG with every storage attached."""
+    graphrag = create_autospec(GraphRAG, instance=True)
+    # Storages and config are assigned in __post_init__, so the spec lacks them
+    graphrag.chunk_entity_relation_graph = NonCallableMagicMock()
+    graphrag.entities_vdb = NonCallableMagicMock()
+    graphrag.chunks_vdb = NonCallableMagicMock()  # Naive RAG enabled
+    graphrag.full_docs = NonCallableMagicMock()
+    graphrag.text_chunks = NonCallableMagicMock()
+    graphrag.community_reports = NonCallableMagicMock()
+    graphrag.llm_response_cache = NonCallableMagicMock()
+    graphrag.config = MockConfig()
+    return graphrag
@@ -0,0 +1,30 @@
+"""Shared fixtures for backup tests."""
+
+from unittest.mock import DEFAULT, patch
+
+import pytest
+
+from tests.backup._helpers import build_mock_graphrag
+
+
+@pytest.fixture
+def mock_graphrag_factory():
+    """Hand out independent GraphRAG mocks; each call builds a fresh autospec."""
+    return build_mock_graphrag
+
+
+@pytest.fixture
+def exporter_mocks():
+    """Autospec the backup manager's exporters.
+
+    Their async methods (export, get_statistics, restore) come back as
+    AsyncMocks, so tests only need to set return values.
+    """
+    with patch.multiple(
+        'nano_graphrag.backup.manager',
+        autospec=True,
+        Neo4jExporter=DEFAULT,
+        QdrantExporter=DEFAULT,
+        KVExporter=DEFAULT
+    ) as mocks:
+        yield mocks
@@ -1,149 +1,166 @@
 """Tests for backup API endpoints."""
 
 import pytest
-import tempfile
 from pathlib import Path
 from unittest.mock import AsyncMock, MagicMock, patch
+from fastapi.responses import StreamingResponse
 from fastapi.testclient import TestClient
 from datetime import datetime, timezone
 import io
 
 from nano_graphrag.api.app import create_app
+from nano_graphrag.api.models import JobProgress, JobResponse, JobStatus
+from nano_graphrag.api.routers.backup import get_backup_manager, get_job_manager
 from nano_graphrag.backup.models import BackupMetadata
 
+# The endpoints only echo timestamps back, so a frozen value is enough
+_NOW = datetime(2024, 1, 1, tzinfo=timezone.utc)
 
-@pytest.fixture
+
+@pytest.fixture(scope="module")
 def mock_app():
-    """Create test FastAPI app with mocked dependencies."""
-    app = create_app()
+    """Create the FastAPI app once for the module."""
+    return create_app()
 
-    # Mock GraphRAG
-    app.state.graphrag = MagicMock()
-    app.state.redis_client = None
 
-    return app
+@pytest.fixture(autouse=True)
+def _reset_app_state(mock_app, tmp_path, monkeypatch):
+    """Give each test a fresh mocked GraphRAG and a throwaway backup dir."""
+    mock_app.state.graphrag = MagicMock()
+    mock_app.state.redis_client = None
+    monkeypatch.setattr('nano_graphrag.api.routers.backup.BACKUP_DIR', str(tmp_path))
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def client(mock_app):
     """Create test client."""
     return TestClient(mock_app)
 
 
-def test_create_backup_endpoint(client):
+@pytest.fixture
+def backup_mocks(mock_app):
+    """Override the backup router's manager dependencies with mocks."""
+    mocks = {"backup_manager": MagicMock(), "job_manager": MagicMock()}
+    mock_app.dependency_overrides[get_backup_manager] = lambda: mocks["backup_manager"]
+    mock_app.dependency_overrides[get_job_manager] = lambda: mocks["job_manager"]
+    yield mocks
+    mock_app.dependency_overrides.clear()
+
+
+def _pending_job(job_id):
+    """Build the job record the router returns right after scheduling."""
+    return JobResponse(
+        job_id=job_id,
+        status=JobStatus.PENDING,
+        created_at=_NOW,
+        doc_ids=[],
+        progress=JobProgress(current=0, total=0, phase="initializing")
+    )
+
+
+def test_create_backup_endpoint(client, backup_mocks):
     """Test POST /backup endpoint."""
-    with patch('nano_graphrag.api.routers.backup.BackupManager') as mock_manager_class:
-        mock_manager = mock_manager_class.return_value
-        mock_manager.create_backup = AsyncMock(return_value=BackupMetadata(
-            backup_id="test_backup",
-            created_at=datetime.now(timezone.utc),
+    mock_manager = backup_mocks["backup_manager"]
+    mock_manager.create_backup = AsyncMock(return_value=BackupMetadata(
+        backup_id="test_backup",
+        created_at=_NOW,
+        size_bytes=1024,
+        backends={"graph": "neo4j", "vector": "qdrant"},
+        statistics={"entities": 100}
+    ))
+
+    mock_job_instance = backup_mocks["job_manager"]
+    mock_job_instance.create_job = AsyncMock(return_value="job123")
+    mock_job_instance.get_job = AsyncMock(return_value=_pending_job("job123"))
+    mock_job_instance.update_job_status = AsyncMock()
+
+    response = client.post("/api/v1/backup")
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["job_id"] == "job123"
+
+
+def test_list_backups_endpoint(client, backup_mocks):
+    """Test GET /backup endpoint."""
+    mock_manager = backup_mocks["backup_manager"]
+    mock_manager.list_backups = AsyncMock(return_value=[
+        BackupMetadata(
+            backup_id="backup1",
+            created_at=_NOW,
             size_bytes=1024,
-            backends={"graph": "neo4j", "vector": "qdrant"},
+            backends={"graph": "neo4j"},
             statistics={"entities": 100}
-        ))
+        ),
+        BackupMetadata(
+            backup_id="backup2",
+            created_at=_NOW,
+            size_bytes=2048,
+            backends={"graph": "neo4j"},
+            statistics={"entities": 200}
+        )
+    ])
 
-        with patch('nano_graphrag.api.routers.backup.JobManager') as mock_job_manager:
-            mock_job_instance = mock_job_manager.return_value
-            mock_job_instance.create_job = AsyncMock(return_value="job123")
-            mock_job_instance.get_job = AsyncMock(return_value=MagicMock(
-                job_id="job123",
-                status="pending"
-            ))
+    response = client.get("/api/v1/backup")
 
-            response = client.post("/api/v1/backup")
+    assert response.status_code == 200
+    data = response.json()
+    assert len(data) == 2
+    assert data[0]["backup_id"] == "backup1"
+    assert data[1]["backup_id"] == "backup2"
 
-            assert response.status_code == 200
-            data = response.json()
-            assert data["job_id"] == "job123"
 
+def _in_memory_file_response(path, media_type=None, filename=None, headers=None):
+    """Stand-in for FileResponse that streams fake content instead of reading path."""
+    return StreamingResponse(io.BytesIO(b"fake backup content"), media_type=media_type, headers=headers)
 
-def test_list_backups_endpoint(client):
-    """Test GET /backup endpoint."""
-    with patch('nano_graphrag.api.routers.backup.BackupManager') as mock_manager_class:
-        mock_manager = mock_manager_class.return_value
-        mock_manager.list_backups = AsyncMock(return_value=[
-            BackupMetadata(
-                backup_id="backup1",
-                created_at=datetime.now(timezone.utc),
-                size_bytes=1024,
-                backends={"graph": "neo4j"},
-                statistics={"entities": 100}
-            ),
-            BackupMetadata(
-                backup_id="backup2",
-                created_at=datetime.now(timezone.utc),
-                size_bytes=2048,
-                backends={"graph": "neo4j"},
-                statistics={"entities": 200}
-            )
-        ])
-
-        response = client.get("/api/v1/backup")
-
-        assert response.status_code == 200
-        data = response.json()
-        assert len(data) == 2
-        assert data[0]["backup_id"] == "backup1"
-        assert data[1]["backup_id"] == "backup2"
-
-
-def test_download_backup_endpoint(client):
-    """Test GET /backup/{backup_id}/download endpoint."""
-    with tempfile.NamedTemporaryFile(suffix=".ngbak", delete=False) as tmpfile:
-        tmpfile.write(b"fake backup content")
-        tmppath = Path(tmpfile.name)
 
-    try:
-        with patch('nano_graphrag.api.routers.backup.BackupManager') as mock_manager_class:
-            mock_manager = mock_manager_class.return_value
-            mock_manager.get_backup_path = AsyncMock(return_value=tmppath)
+def test_download_backup_endpoint(client, backup_mocks):
+    """Test GET /backup/{backup_id}/download endpoint."""
+    mock_manager = backup_mocks["backup_manager"]
+    mock_manager.get_backup_path = AsyncMock(return_value=Path("test_backup.ngbak"))
 
-            response = client.get("/api/v1/backup/test_backup/download")
+    with patch('nano_graphrag.api.routers.backup.FileResponse', _in_memory_file_response):
+        response = client.get("/api/v1/backup/test_backup/download")
 
-            assert response.status_code == 200
-            assert response.headers["content-type"] == "application/gzip"
-            assert "attachment" in response.headers["content-disposition"]
-    finally:
-        tmppath.unlink()
+    assert response.status_code == 200
+    assert response.content == b"fake backup content"
+    assert response.headers["content-type"] == "application/gzip"
+    assert "attachment" in response.headers["content-disposition"]
 
 
-def test_download_backup_not_found(client):
+def test_download_backup_not_found(client, backup_mocks):
     """Test download with non-existent backup."""
-    with patch('nano_graphrag.api.routers.backup.BackupManager') as mock_manager_class:
-        mock_manager = mock_manager_class.return_value
-        mock_manager.get_backup_path = AsyncMock(return_value=None)
+    mock_manager = backup_mocks["backup_manager"]
+    mock_manager.get_backup_path = AsyncMock(return_value=None)
 
-        response = client.get("/api/v1/backup/non_existent/download")
+    response = client.get("/api/v1/backup/non_existent/download")
 
-        assert response.status_code == 404
-        assert "not found" in response.json()["detail"].lower()
+    assert response.status_code == 404
+    assert "not found" in response.json()["detail"].lower()
 
 
-def test_restore_backup_endpoint(client):
+def test_restore_backup_endpoint(client, backup_mocks):
     """Test POST /backup/restore endpoint."""
-    with patch('nano_graphrag.api.routers.backup.BackupManager') as mock_manager_class:
-        mock_manager = mock_manager_class.return_value
-        mock_manager.restore_backup = AsyncMock()
+    mock_manager = backup_mocks["backup_manager"]
+    mock_manager.restore_backup = AsyncMock()
 
-        with patch('nano_graphrag.api.routers.backup.JobManager') as mock_job_manager:
-            mock_job_instance = mock_job_manager.return_value
-            mock_job_instance.create_job = AsyncMock(return_value="job456")
-            mock_job_instance.get_job = AsyncMock(return_value=MagicMock(
-                job_id="job456",
-                status="pending"
-            ))
+    mock_job_instance = backup_mocks["job_manager"]
+    mock_job_instance.create_job = AsyncMock(return_value="job456")
+    mock_job_instance.get_job = AsyncMock(return_value=_pending_job("job456"))
+    mock_job_instance.update_job_status = AsyncMock()
 
-            # Create fake backup file
-            fake_file = io.BytesIO(b"fake backup content")
+    # Create fake backup file
+    fake_file = io.BytesIO(b"fake backup content")
 
-            response = client.post(
-                "/api/v1/backup/restore",
-                files={"file": ("test_backup.ngbak", fake_file, "application/gzip")}
-            )
+    response = client.post(
+        "/api/v1/backup/restore",
+        files={"file": ("test_backup.ngbak", fake_file, "application/gzip")}
+    )
 
-            assert response.status_code == 200
-            data = response.json()
-            assert data["job_id"] == "job456"
+    assert response.status_code == 200
+    data = response.json()
+    assert data["job_id"] == "job456"
 
 
 def test_restore_invalid_file_type(client):
@@ -159,25 +176,23 @@ def test_restore_invalid_file_type(client):
     assert "must be a .ngbak archive" in response.json()["detail"]
 
 
-def test_delete_backup_endpoint(client):
+def test_delete_backup_endpoint(client, backup_mocks):
     """Test DELETE /backup/{backup_id} endpoint."""
-    with patch('nano_graphrag.api.routers.backup.BackupManager') as mock_manager_class:
-        mock_manager = mock_manager_class.return_value
-        mock_manager.delete_backup = AsyncMock(return_value=True)
+    mock_manager = backup_mocks["backup_manager"]
+    mock_manager.delete_backup = AsyncMock(return_value=True)
 
-        response = client.delete("/api/v1/backup/test_backup")
+    response = client.delete("/api/v1/backup/test_backup")
 
-        assert response.status_code == 200
-        assert "deleted" in response.json()["message"].lower()
+    assert response.status_code == 200
+    assert "deleted" in response.json()["message"].lower()
 
 
-def test_delete_backup_not_found(client):
+def test_delete_backup_not_found(client, backup_mocks):
     """Test delete with non-existent backup."""
-    with patch('nano_graphrag.api.routers.backup.BackupManager') as mock_manager_class:
-        mock_manager = mock_manager_class.return_value
-        mock_manager.delete_backup = AsyncMock(return_value=False)
+    mock_manager = backup_mocks["backup_manager"]
+    mock_manager.delete_backup = AsyncMock(return_value=False)
 
-        response = client.delete("/api/v1/backup/non_existent")
+    response = client.delete("/api/v1/backup/non_existent")
 
-        assert response.status_code == 404
-        assert "not found" in response.json()["detail"].lower()
+    assert response.status_code == 404
+    assert "not found" in response.json()["detail"].lower()
@@ -1,14 +1,13 @@
 """Tests for BackupManager."""
 
 import pytest
-import tempfile
 from pathlib import Path
 from unittest.mock import AsyncMock, MagicMock, patch
 from datetime import datetime, timezone
-from dataclasses import dataclass
 
 from nano_graphrag.backup.manager import BackupManager
 from nano_graphrag.backup.models import BackupManifest
+from tests.backup._helpers import MockConfig
 
 
 class MockStorage:
@@ -29,26 +28,19 @@ class MockGraphRAG:
         self.text_chunks = MockStorage("json")
         self.community_reports = MockStorage("json")
         self.llm_response_cache = MockStorage("json")
-
-        # Add config as a simple object that can be serialized
-        @dataclass
-        class MockConfig:
-            test: str = "config"
-
         self.config = MockConfig()
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def mock_graphrag():
-    """Create mock GraphRAG instance."""
+    """Create mock GraphRAG instance (BackupManager only reads from it, so share one)."""
     return MockGraphRAG()
 
 
 @pytest.fixture
-def temp_backup_dir():
+def temp_backup_dir(tmp_path):
     """Create temporary backup directory."""
-    with tempfile.TemporaryDirectory() as tmpdir:
-        yield Path(tmpdir)
+    return tmp_path
 
 
 @pytest.mark.asyncio
@@ -1,9 +1,9 @@
 """Tests for backup utility functions."""
 
+import asyncio
+import hashlib
 import pytest
-import tempfile
 import json
-from pathlib import Path
 from datetime import datetime, timezone
 
 from nano_graphrag.backup.utils import (
@@ -12,61 +12,73 @@ from nano_graphrag.backup.utils import (
     compute_checksum,
     verify_checksum,
     generate_backup_id,
+    HASH_CHUNK_SIZE,
     save_manifest,
     load_manifest,
 )
 
 
-@pytest.mark.asyncio
-async def test_create_and_extract_archive():
-    """Test archive creation and extraction."""
-    with tempfile.TemporaryDirectory() as tmpdir:
-        tmpdir = Path(tmpdir)
-
-        # Create source directory with test files
-        source_dir = tmpdir / "source"
-        source_dir.mkdir()
-        (source_dir / "test1.txt").write_text("Hello World")
-        (source_dir / "test2.json").write_text('{"key": "value"}')
-
-        # Create archive
-        archive_path = tmpdir / "test.ngbak"
-        size = await create_archive(source_dir, archive_path)
-
-        assert archive_path.exists()
-        assert size > 0
+async def _write_all(pairs):
+    """Write several small fixture files concurrently."""
+    await asyncio.gather(*(asyncio.to_thread(path.write_bytes, data) for path, data in pairs))
 
-        # Extract archive
-        extract_dir = tmpdir / "extracted"
-        await extract_archive(archive_path, extract_dir)
 
-        # Verify extracted files
-        assert (extract_dir / "test1.txt").exists()
-        assert (extract_dir / "test2.json").exists()
-        assert (extract_dir / "test1.txt").read_text() == "Hello World"
+@pytest.mark.asyncio
+async def test_create_and_extract_archive(tmp_path):
+    """Test archive creation and extraction."""
+    # Create source directory with test files
+    source_dir = tmp_path / "source"
+    source_dir.mkdir()
+    await _write_all([
+        (source_dir / "test1.txt", b"Hello World"),
+        (source_dir / "test2.json", b'{"key": "value"}'),
+    ])
+
+    # Create archive
+    archive_path = tmp_path / "test.ngbak"
+    size = await create_archive(source_dir, archive_path)
+
+    assert archive_path.exists()
+    assert size > 0
+
+    # Extract archive
+    extract_dir = tmp_path / "extracted"
+    await extract_archive(archive_path, extract_dir)
+
+    # Verify extracted files
+    test1, test2 = await asyncio.gather(
+        asyncio.to_thread((extract_dir / "test1.txt").read_bytes),
+        asyncio.to_thread((extract_dir / "test2.json").read_bytes),
+    )
+    assert test1 == b"Hello World"
+    assert test2 == b'{"key": "value"}'
+
+
+def test_compute_and_verify_checksum(tmp_path):
+    """Test checksum computation and verification."""
+    filepath = tmp_path / "checksum.txt"
+    filepath.write_text("Test content for checksum")
 
+    # Compute checksum
+    checksum = compute_checksum(filepath)
+    assert checksum.startswith("sha256:")
+    assert len(checksum) > 10
 
-def test_compute_and_verify_checksum():
-    """Test checksum computation and verification."""
-    with tempfile.NamedTemporaryFile(mode='w', delete=False) as f:
-        f.write("Test content for checksum")
-        filepath = Path(f.name)
+    # Verify checksum
+    assert verify_checksum(filepath, checksum) is True
 
-    try:
-        # Compute checksum
-        checksum = compute_checksum(filepath)
-        assert checksum.startswith("sha256:")
-        assert len(checksum) > 10
+    # Modify file and verify again
+    filepath.write_bytes(b"Modified content")
+    assert verify_checksum(filepath, checksum) is False
 
-        # Verify checksum
-        assert verify_checksum(filepath, checksum) is True
 
-        # Modify file and verify again
-        filepath.write_text("Modified content")
-        assert verify_checksum(filepath, checksum) is False
+def test_compute_checksum_spans_chunks(tmp_path):
+    """Test that large-chunk hashing matches a one-shot digest across chunk boundaries."""
+    data = bytes(range(256)) * ((2 * HASH_CHUNK_SIZE + 123) // 256 + 1)
+    filepath = tmp_path / "large.bin"
+    filepath.write_bytes(data)
 
-    finally:
-        filepath.unlink()
+    assert compute_checksum(filepath) == f"sha256:{hashlib.sha256(data).hexdigest()}"
 
 
 def test_generate_backup_id():
@@ -79,27 +91,26 @@ def test_generate_backup_id():
 
 
 @pytest.mark.asyncio
-async def test_save_and_load_manifest():
+async def test_save_and_load_manifest(tmp_path):
     """Test manifest save and load."""
-    with tempfile.TemporaryDirectory() as tmpdir:
-        manifest_path = Path(tmpdir) / "manifest.json"
-
-        # Create test manifest
-        manifest_data = {
-            "backup_id": "test_backup",
-            "created_at": datetime.now(timezone.utc).isoformat(),
-            "nano_graphrag_version": "0.1.0",
-            "storage_backends": {"graph": "neo4j", "vector": "qdrant"},
-            "statistics": {"entities": 100, "relationships": 200},
-            "checksum": "sha256:abc123"
-        }
-
-        # Save manifest
-        await save_manifest(manifest_data, manifest_path)
-        assert manifest_path.exists()
-
-        # Load manifest
-        loaded_data = await load_manifest(manifest_path)
-        assert loaded_data["backup_id"] == "test_backup"
-        assert loaded_data["storage_backends"]["graph"] == "neo4j"
-        assert loaded_data["statistics"]["entities"] == 100
+    manifest_path = tmp_path / "manifest.json"
+
+    # Create test manifest
+    manifest_data = {
+        "backup_id": "test_backup",
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "nano_graphrag_version": "0.1.0",
+        "storage_backends": {"graph": "neo4j", "vector": "qdrant"},
+        "statistics": {"entities": 100, "relationships": 200},
+        "checksum": "sha256:abc123"
+    }
+
+    # Save manifest
+    await save_manifest(manifest_data, manifest_path)
+    assert manifest_path.exists()
+
+    # Load manifest
+    loaded_data = await load_manifest(manifest_path)
+    assert loaded_data["backup_id"] == "test_backup"
+    assert loaded_data["storage_backends"]["graph"] == "neo4j"
+    assert loaded_data["statistics"]["entities"] == 100
@@ -16,6 +16,7 @@ from tests.storage.base.fixtures import (
     deterministic_embedding_func
 )
 
+
 # Re-export fixtures for global use
 __all__ = [
     "temp_storage_dir",
@@ -0,0 +1,63 @@
+"""Shared fixtures for entity extraction tests."""
+
+import tempfile
+from pathlib import Path
+from unittest.mock import NonCallableMagicMock
+from uuid import uuid4
+
+import pytest
+
+from nano_graphrag._utils import TokenizerWrapper
+from nano_graphrag.base import BaseGraphStorage, BaseVectorStorage
+
+
+@pytest.fixture(scope="session")
+def _tmp_root():
+    """One temp directory for the whole session, removed once at the end."""
+    with tempfile.TemporaryDirectory(prefix="ng_tests_") as root:
+        yield Path(root)
+
+
+@pytest.fixture
+def tmp_path(_tmp_root):
+    """Per-test subdirectory of the session temp root.
+
+    Overrides pytest's tmp_path for this package: no per-test tempdir
+    bookkeeping or cleanup, the session finalizer removes everything.
+    """
+    path = _tmp_root / f"t_{uuid4().hex}"
+    path.mkdir()
+    return path
+
+
+@pytest.fixture(scope="session")
+def graph_mock_factory():
+    """Build fresh graph storage mocks specced on BaseGraphStorage.
+
+    The spec turns every async storage method into an AsyncMock, so only
+    the lookups that must report "not found" need explicit return values.
+    """
+    def factory():
+        mock_graph = NonCallableMagicMock(spec=BaseGraphStorage)
+        mock_graph.get_node.return_value = None
+        mock_graph.has_node.return_value = False
+        mock_graph.has_edge.return_value = False
+        return mock_graph
+    return factory
+
+
+@pytest.fixture(scope="session")
+def vdb_mock_factory():
+    """Build fresh vector storage mocks specced on BaseVectorStorage."""
+    return lambda: NonCallableMagicMock(spec=BaseVectorStorage)
+
+
+@pytest.fixture(scope="session")
+def tokenizer_mock_factory():
+    """Build fresh tokenizer mocks with fixed encode/decode output."""
+    def factory():
+        mock_tokenizer = NonCallableMagicMock(spec=TokenizerWrapper)
+        mock_tokenizer.encode.return_value = [1, 2, 3]
+        mock_tokenizer.decode.return_value = "decoded text"
+        return mock_tokenizer
+    return factory
@@ -24,21 +24,25 @@ class MockEntityExtractor(BaseEntityExtractor):
         """Extract entities with predictable pattern."""
         nodes = {}
         edges = []
+        first_key = None
 
         for chunk_id, chunk_data in chunks.items():
             # Create predictable entities
-            nodes[f"ENTITY_{chunk_id}"] = {
-                "entity_name": f"ENTITY_{chunk_id}",
+            key = f"ENTITY_{chunk_id}"
+            nodes[key] = {
+                "entity_name": key,
                 "entity_type": "PERSON",
                 "description": f"Mock entity from {chunk_id}",
                 "source_id": chunk_id
             }
 
-            # Create predictable relationships
-            if len(nodes) > 1:
+            # Create predictable relationships back to the first entity
+            if first_key is None:
+                first_key = key
+            else:
                 edges.append((
-                    f"ENTITY_{chunk_id}",
-                    list(nodes.keys())[0],
+                    key,
+                    first_key,
                     {
                         "weight": 1.0,
                         "description": "Mock relationship",
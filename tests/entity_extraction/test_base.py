@@ -1,5 +1,8 @@
 """Tests for base entity extraction abstraction."""
 
+import asyncio
+import time
+
 import pytest
 from nano_graphrag.entity_extraction.base import (
     BaseEntityExtractor,
@@ -119,6 +122,35 @@ class TestBaseEntityExtractor:
         assert len(results) == 3
         assert all(isinstance(r, ExtractionResult) for r in results)
 
+    @pytest.mark.asyncio
+    async def test_batch_extract_runs_concurrently(self):
+        """Test batch extraction overlaps slow calls but respects batch_size."""
+        in_flight = 0
+        peak_in_flight = 0
+
+        class SlowMockExtractor(MockEntityExtractor):
+            async def extract_single(self, text, chunk_id=None):
+                nonlocal in_flight, peak_in_flight
+                in_flight += 1
+                peak_in_flight = max(peak_in_flight, in_flight)
+                await asyncio.sleep(0.05)
+                in_flight -= 1
+                return await super().extract_single(text, chunk_id)
+
+        extractor = SlowMockExtractor(ExtractorConfig())
+        await extractor.initialize()
+
+        chunks = {f"chunk{i}": {"content": f"Text {i}"} for i in range(4)}
+
+        start = time.perf_counter()
+        results = await extractor.batch_extract(chunks, batch_size=2)
+        duration = time.perf_counter() - start
+
+        assert [r.metadata["chunk_id"] for r in results] == list(chunks)
+        assert peak_in_flight == 2
+        # Serial extraction would take 4 * 0.05s
+        assert duration < 4 * 0.05 * 0.75, f"Batch extraction took {duration}s"
+
     @pytest.mark.asyncio
     async def test_deduplicate_entities(self):
         """Test entity deduplication."""
@@ -152,6 +184,22 @@ class TestBaseEntityExtractor:
         # Should have 2 unique edges (one duplicate removed)
         assert len(deduplicated.edges) == 2
 
+    def test_deduplicate_entities_scales_linearly(self):
+        """Test edge deduplication stays set-based on large edge lists."""
+        edges = [
+            (f"ENTITY{i}", f"ENTITY{i + 1}", {"description": f"rel {i}"})
+            for i in range(10_000)
+        ]
+        results = [ExtractionResult(nodes={}, edges=edges), ExtractionResult(nodes={}, edges=edges)]
+
+        start = time.perf_counter()
+        deduplicated = BaseEntityExtractor.deduplicate_entities(results)
+        duration = time.perf_counter() - start
+
+        assert len(deduplicated.edges) == 10_000
+        # A linear scan over seen edges would take seconds here
+        assert duration < 1.0, f"Deduplicating 20K edges took {duration}s"
+
     @pytest.mark.asyncio
     async def test_empty_extraction(self):
         """Test extraction with empty results."""
@@ -2,196 +2,154 @@
 
 import asyncio
 import pytest
-from unittest.mock import AsyncMock, MagicMock
 
 from nano_graphrag.entity_extraction.llm import LLMEntityExtractor
 from nano_graphrag.entity_extraction.base import ExtractorConfig
 
 
-@pytest.mark.asyncio
-async def test_continuation_when_truncated():
-    """Test that continuation is triggered when output is truncated."""
-
-    # Mock model function that returns truncated output first, then continuation
-    call_count = 0
-    async def mock_model_func(prompt, **kwargs):
-        nonlocal call_count
-        call_count += 1
-
-        if "Continue extracting" in prompt:
-            # Continuation call - return relationships and completion in NDJSON format
-            return """{"type":"relationship","source":"ALICE","target":"BOB","description":"Alice works with Bob","strength":8}
-{"type":"relationship","source":"BOB","target":"CHARLIE","description":"Bob manages Charlie","strength":7}
-<|COMPLETE|>"""
-        else:
-            # Initial call - return entities in NDJSON but truncated (no completion delimiter)
-            return """{"type":"entity","name":"ALICE","entity_type":"PERSON","description":"Alice is a software engineer"}
+# Initial call - entities in NDJSON but truncated (no completion delimiter)
+_TRUNCATED_ENTITIES = """{"type":"entity","name":"ALICE","entity_type":"PERSON","description":"Alice is a software engineer"}
 {"type":"entity","name":"BOB","entity_type":"PERSON","description":"Bob is a manager"}
 {"type":"entity","name":"CHARLIE","entity_type":"PERSON","description":"Charlie is a developer"}
 ..."""
 
-    config = ExtractorConfig(
-        max_gleaning=0,
-        max_continuation_attempts=5,
-        model_func=mock_model_func
-    )
+# Continuation call - relationships and completion in NDJSON format
+_CONTINUED_RELATIONSHIPS = """{"type":"relationship","source":"ALICE","target":"BOB","description":"Alice works with Bob","strength":8}
+{"type":"relationship","source":"BOB","target":"CHARLIE","description":"Bob manages Charlie","strength":7}
+<|COMPLETE|>"""
 
-    extractor = LLMEntityExtractor(config)
-    result = await extractor.extract_single("Test text", chunk_id="test-1")
+# Complete extraction with delimiter in NDJSON format
+_COMPLETE_OUTPUT = """{"type":"entity","name":"ALICE","entity_type":"PERSON","description":"Alice is a software engineer"}
+{"type":"entity","name":"BOB","entity_type":"PERSON","description":"Bob is a manager"}
+{"type":"relationship","source":"ALICE","target":"BOB","description":"Alice works with Bob","strength":8}
+<|COMPLETE|>"""
 
-    # Should have called model twice (initial + 1 continuation)
-    assert call_count == 2
+# Gleaning call - NDJSON format
+_GLEANED_ENTITY = """{"type":"entity","name":"DAVID","entity_type":"PERSON","description":"David is a designer"}"""
 
-    # Should have extracted all entities
-    assert len(result.nodes) == 3
-    # Note: clean_str adds quotes around the names
-    assert '"ALICE"' in result.nodes or 'ALICE' in result.nodes
-    assert '"BOB"' in result.nodes or 'BOB' in result.nodes
-    assert '"CHARLIE"' in result.nodes or 'CHARLIE' in result.nodes
 
-    # Should have extracted relationships from continuation (BOB->CHARLIE came through)
-    assert len(result.edges) >= 1  # At least one relationship extracted
-    edge_pairs = [(e[0], e[1]) for e in result.edges]
-    # Check if any relationship was extracted (with or without quotes)
-    assert any('BOB' in e[0] or 'BOB' in e[1] for e in edge_pairs)
+def _respond_truncated(prompt, call_number):
+    if "Continue extracting" in prompt:
+        return _CONTINUED_RELATIONSHIPS
+    return _TRUNCATED_ENTITIES
 
 
-@pytest.mark.asyncio
-async def test_no_continuation_when_complete():
-    """Test that continuation is NOT triggered when output is complete."""
+def _respond_complete(prompt, call_number):
+    return _COMPLETE_OUTPUT
 
-    call_count = 0
-    async def mock_model_func(prompt, **kwargs):
-        nonlocal call_count
-        call_count += 1
 
-        # Return complete extraction with delimiter in NDJSON format
-        return """{"type":"entity","name":"ALICE","entity_type":"PERSON","description":"Alice is a software engineer"}
-{"type":"entity","name":"BOB","entity_type":"PERSON","description":"Bob is a manager"}
-{"type":"relationship","source":"ALICE","target":"BOB","description":"Alice works with Bob","strength":8}
-<|COMPLETE|>"""
+def _respond_never_complete(prompt, call_number):
+    # Never return completion delimiter - use NDJSON format with ellipsis on new line
+    return f'{{"type":"entity","name":"ENTITY_{call_number}","entity_type":"PERSON","description":"Description {call_number}"}}\n...'
 
-    config = ExtractorConfig(
-        max_gleaning=0,
-        max_continuation_attempts=5,
-        model_func=mock_model_func
-    )
-
-    extractor = LLMEntityExtractor(config)
-    result = await extractor.extract_single("Test text", chunk_id="test-2")
 
-    # Should have called model only once
-    assert call_count == 1
+def _respond_with_gleaning(prompt, call_number):
+    if "Continue extracting" in prompt:
+        return _CONTINUED_RELATIONSHIPS
+    if "MANY entities were missed" in prompt:
+        return _GLEANED_ENTITY
+    if "Answer YES | NO" in prompt:
+        return "NO"
+    return _TRUNCATED_ENTITIES
 
-    # Should have extracted everything
-    assert len(result.nodes) == 2
-    assert len(result.edges) == 1
 
+def _counting_model_func(respond):
+    """Wrap a (prompt, call_number) -> output function into a model_func that records calls."""
+    calls = []
 
-@pytest.mark.asyncio
-async def test_max_continuation_attempts():
-    """Test that continuation stops after max attempts."""
-
-    call_count = 0
     async def mock_model_func(prompt, **kwargs):
-        nonlocal call_count
-        call_count += 1
+        calls.append(prompt)
+        return respond(prompt, len(calls))
+
+    return mock_model_func, calls
 
-        # Never return completion delimiter - use NDJSON format with ellipsis on new line
-        return f'{{"type":"entity","name":"ENTITY_{call_count}","entity_type":"PERSON","description":"Description {call_count}"}}\n...'
 
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "respond, max_gleaning, max_continuation_attempts, expected_calls, expected_nodes, required_nodes, edge_bounds, edge_endpoint",
+    [
+        # Truncated output triggers one continuation that completes
+        (_respond_truncated, 0, 5, 2, 3, ("ALICE", "BOB", "CHARLIE"), (1, None), "BOB"),
+        # Complete output never triggers continuation
+        (_respond_complete, 0, 5, 1, 2, ("ALICE", "BOB"), (1, 1), None),
+        # Continuation stops after max attempts (initial + 3 continuations)
+        (_respond_never_complete, 0, 3, 4, 4, (), (0, None), None),
+        # Continuation and gleaning work together (initial, continuation, gleaning)
+        (_respond_with_gleaning, 1, 5, 3, 4, ("DAVID",), (1, None), None),
+    ],
+    ids=["when_truncated", "no_continuation_when_complete", "max_attempts", "with_gleaning"],
+)
+async def test_continuation(
+    respond,
+    max_gleaning,
+    max_continuation_attempts,
+    expected_calls,
+    expected_nodes,
+    required_nodes,
+    edge_bounds,
+    edge_endpoint,
+):
+    """Test continuation triggering, stopping and interaction with gleaning."""
+    mock_model_func, calls = _counting_model_func(respond)
     config = ExtractorConfig(
-        max_gleaning=0,
-        max_continuation_attempts=3,
+        max_gleaning=max_gleaning,
+        max_continuation_attempts=max_continuation_attempts,
         model_func=mock_model_func
     )
 
     extractor = LLMEntityExtractor(config)
-    result = await extractor.extract_single("Test text", chunk_id="test-3")
-
-    # Should have called model 4 times (initial + 3 continuations)
-    assert call_count == 4
-
-    # Should have entities from all calls
-    assert len(result.nodes) == 4
-
-
-@pytest.mark.asyncio
-async def test_continuation_with_gleaning():
-    """Test that continuation and gleaning work together."""
-
-    call_history = []
-    async def mock_model_func(prompt, **kwargs):
-        call_history.append(prompt[:50] if len(prompt) > 50 else prompt)
+    result = await extractor.extract_single("Test text", chunk_id="test-continuation")
 
+    assert len(calls) == expected_calls
+    assert len(result.nodes) == expected_nodes
+    # Note: clean_str adds quotes around the names
+    for name in required_nodes:
+        assert f'"{name}"' in result.nodes or name in result.nodes
+    min_edges, max_edges = edge_bounds
+    assert len(result.edges) >= min_edges
+    if max_edges is not None:
+        assert len(result.edges) <= max_edges
+    if edge_endpoint is not None:
+        # Relationships from the continuation came through (with or without quotes)
+        assert any(edge_endpoint in e[0] or edge_endpoint in e[1] for e in result.edges)
+
+
+# Outputs that should be detected as truncated, built once at import
+_TRUNCATION_CASES = (
+    "...entities continue...",  # Ends with ...
+    "and many more etc",  # Ends with etc
+    "and many more etc.",  # Ends with etc.
+    "A" * 2000,  # Long output without completion
+)
+
+
+def _respond_truncated_with(output):
+    """Build a responder that returns ``output`` until asked to continue."""
+    def respond(prompt, call_number):
         if "Continue extracting" in prompt:
-            return """{"type":"relationship","source":"ALICE","target":"BOB","description":"Alice works with Bob","strength":8}
-{"type":"relationship","source":"BOB","target":"CHARLIE","description":"Bob manages Charlie","strength":7}
-<|COMPLETE|>"""
-        elif "MANY entities were missed" in prompt:
-            # Gleaning call - NDJSON format
-            return """{"type":"entity","name":"DAVID","entity_type":"PERSON","description":"David is a designer"}"""
-        elif "Answer YES | NO" in prompt:
-            # Check if more gleaning needed
-            return "NO"
-        else:
-            # Initial call - truncated NDJSON format
-            return """{"type":"entity","name":"ALICE","entity_type":"PERSON","description":"Alice is a software engineer"}
-{"type":"entity","name":"BOB","entity_type":"PERSON","description":"Bob is a manager"}
-{"type":"entity","name":"CHARLIE","entity_type":"PERSON","description":"Charlie is an intern"}
-..."""
+            return "<|COMPLETE|>"
+        return output
+    return respond
+
 
+async def _count_calls_for(output):
+    mock_model_func, calls = _counting_model_func(_respond_truncated_with(output))
     config = ExtractorConfig(
-        max_gleaning=1,
+        max_gleaning=0,
         max_continuation_attempts=5,
         model_func=mock_model_func
     )
 
     extractor = LLMEntityExtractor(config)
-    result = await extractor.extract_single("Test text", chunk_id="test-4")
-
-    # Should have: initial, continuation, gleaning (check might be skipped if we have completion)
-    assert len(call_history) >= 3
-
-    # Should have all entities
-    assert len(result.nodes) == 4  # ALICE, BOB, CHARLIE, DAVID
-    assert '"DAVID"' in result.nodes or 'DAVID' in result.nodes  # From gleaning (with or without quotes)
-
-    # Should have at least one relationship from continuation
-    # Note: The exact count may vary due to parsing edge cases with ellipsis
-    assert len(result.edges) >= 1  # At least one relationship extracted
+    await extractor.extract_single("Test text", chunk_id="test-truncation")
+    return len(calls)
 
 
 @pytest.mark.asyncio
 async def test_continuation_detects_ellipsis():
     """Test that various truncation indicators trigger continuation."""
+    call_counts = await asyncio.gather(*(_count_calls_for(output) for output in _TRUNCATION_CASES))
 
-    test_cases = [
-        "...entities continue...",  # Ends with ...
-        "and many more etc",  # Ends with etc
-        "and many more etc.",  # Ends with etc.
-        "A" * 2000,  # Long output without completion
-    ]
-
-    for truncated_output in test_cases:
-        call_count = 0
-        async def mock_model_func(prompt, **kwargs):
-            nonlocal call_count
-            call_count += 1
-
-            if "Continue extracting" in prompt:
-                return "<|COMPLETE|>"
-            else:
-                return truncated_output
-
-        config = ExtractorConfig(
-            max_gleaning=0,
-            max_continuation_attempts=5,
-            model_func=mock_model_func
-        )
-
-        extractor = LLMEntityExtractor(config)
-        result = await extractor.extract_single("Test text", chunk_id="test-truncation")
-
-        # Should have triggered continuation
-        assert call_count == 2, f"Failed to detect truncation in: {truncated_output[-20:]}"
\ No newline at end of file
+    # Every case should have triggered continuation
+    for truncated_output, call_count in zip(_TRUNCATION_CASES, call_counts):
+        assert call_count == 2, f"Failed to detect truncation in: {truncated_output[-20:]}"
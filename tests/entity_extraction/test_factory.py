@@ -6,15 +6,23 @@ from nano_graphrag.entity_extraction.factory import create_extractor
 from nano_graphrag.entity_extraction.llm import LLMEntityExtractor
 from nano_graphrag.entity_extraction.dspy_extractor import DSPyEntityExtractor
 from nano_graphrag.entity_extraction.base import BaseEntityExtractor
+# Imported at collection so create_extractor's importlib lookup hits sys.modules
+from .mock_extractors import MockEntityExtractor
+
+MOCK_EXTRACTOR_PATH = f"{MockEntityExtractor.__module__}.{MockEntityExtractor.__qualname__}"
+
+
+@pytest.fixture(scope="module")
+def mock_model_func():
+    """Shared model function; factory tests never inspect its calls."""
+    return AsyncMock(return_value="test response")
 
 
 class TestExtractorFactory:
     """Test entity extractor factory."""
 
-    def test_create_llm_extractor(self):
+    def test_create_llm_extractor(self, mock_model_func):
         """Test creating LLM extractor."""
-        mock_model_func = AsyncMock(return_value="test response")
-
         extractor = create_extractor(
             strategy="llm",
             model_func=mock_model_func,
@@ -27,10 +35,8 @@ class TestExtractorFactory:
         assert extractor.config.entity_types == ["PERSON", "LOCATION"]
         assert extractor.config.max_gleaning == 2
 
-    def test_create_dspy_extractor(self):
+    def test_create_dspy_extractor(self, mock_model_func):
         """Test creating DSPy extractor."""
-        mock_model_func = AsyncMock(return_value="test response")
-
         extractor = create_extractor(
             strategy="dspy",
             model_func=mock_model_func,
@@ -49,12 +55,12 @@ class TestExtractorFactory:
         """Test creating custom extractor."""
         extractor = create_extractor(
             strategy="custom",
-            custom_extractor_class="tests.entity_extraction.mock_extractors.MockEntityExtractor"
+            custom_extractor_class=MOCK_EXTRACTOR_PATH
         )
 
         assert isinstance(extractor, BaseEntityExtractor)
         # Should be instance of MockEntityExtractor
-        assert extractor.__class__.__name__ == "MockEntityExtractor"
+        assert isinstance(extractor, MockEntityExtractor)
 
     def test_invalid_strategy(self):
         """Test invalid strategy raises error."""
@@ -69,10 +75,8 @@ class TestExtractorFactory:
                 custom_extractor_class="non.existent.Class"
             )
 
-    def test_default_entity_types(self):
+    def test_default_entity_types(self, mock_model_func):
         """Test default entity types are set correctly."""
-        mock_model_func = AsyncMock()
-
         extractor = create_extractor(
             strategy="llm",
             model_func=mock_model_func
@@ -82,12 +86,13 @@ class TestExtractorFactory:
             "PERSON", "ORGANIZATION", "LOCATION", "EVENT", "CONCEPT"
         ]
 
-    def test_strategy_case_insensitive(self):
-        """Test strategy is case insensitive."""
-        mock_model_func = AsyncMock()
-
-        extractor1 = create_extractor(strategy="LLM", model_func=mock_model_func)
-        extractor2 = create_extractor(strategy="llm", model_func=mock_model_func)
+    @pytest.mark.parametrize("strategy, expected_cls", [
+        ("llm", LLMEntityExtractor),
+        ("LLM", LLMEntityExtractor),  # Strategy is case insensitive
+        ("dspy", DSPyEntityExtractor),
+    ])
+    def test_strategy_dispatch(self, strategy, expected_cls, mock_model_func):
+        """Test each strategy name maps to its extractor class."""
+        extractor = create_extractor(strategy=strategy, model_func=mock_model_func)
 
-        assert isinstance(extractor1, LLMEntityExtractor)
-        assert isinstance(extractor2, LLMEntityExtractor)
\ No newline at end of file
+        assert isinstance(extractor, expected_cls)
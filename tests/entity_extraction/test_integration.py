@@ -2,65 +2,44 @@
 
 import pytest
 import os
-from unittest.mock import AsyncMock, MagicMock
+from unittest.mock import AsyncMock
 from nano_graphrag import GraphRAG
 from nano_graphrag.config import GraphRAGConfig, EntityExtractionConfig
 from nano_graphrag.entity_extraction.base import ExtractionResult
 
 
-class TestGraphRAGIntegration:
-    """Test entity extraction integration with GraphRAG."""
-
-    @pytest.mark.asyncio
-    async def test_graphrag_with_llm_extraction(self, tmp_path):
-        """Test GraphRAG with LLM extraction strategy."""
-        from nano_graphrag.config import StorageConfig
+# Configs are frozen dataclasses, so one shared instance per strategy is safe
+_LLM_CFG = EntityExtractionConfig(strategy="llm", max_gleaning=1)
+_DSPY_CFG = EntityExtractionConfig(strategy="dspy", max_gleaning=0)
+_LLM_GRAPHRAG_CFG = GraphRAGConfig(entity_extraction=_LLM_CFG)
+_DSPY_GRAPHRAG_CFG = GraphRAGConfig(entity_extraction=_DSPY_CFG)
 
-        config = GraphRAGConfig(
-            storage=StorageConfig(working_dir=str(tmp_path)),
-            entity_extraction=EntityExtractionConfig(
-                strategy="llm",
-                max_gleaning=1
-            )
-        )
-
-        # Create GraphRAG instance
-        rag = GraphRAG(config)
-
-        # Verify extractor was initialized correctly
-        assert rag.entity_extractor is not None
-        assert rag.entity_extractor.__class__.__name__ == "LLMEntityExtractor"
-        assert rag.entity_extraction_func is not None
-
-    @pytest.mark.asyncio
-    async def test_graphrag_with_dspy_extraction(self, tmp_path):
-        """Test GraphRAG with DSPy extraction strategy."""
-        from nano_graphrag.config import StorageConfig
 
-        config = GraphRAGConfig(
-            storage=StorageConfig(working_dir=str(tmp_path)),
-            entity_extraction=EntityExtractionConfig(
-                strategy="dspy",
-                max_gleaning=0
-            )
-        )
+class TestGraphRAGIntegration:
+    """Test entity extraction integration with GraphRAG."""
 
-        # Create GraphRAG instance
-        rag = GraphRAG(config)
+    @pytest.mark.parametrize("config, expected_cls_name", [
+        (_LLM_GRAPHRAG_CFG, "LLMEntityExtractor"),
+        (_DSPY_GRAPHRAG_CFG, "DSPyEntityExtractor"),
+    ])
+    def test_graphrag_extraction_strategy(self, config, expected_cls_name):
+        """Test GraphRAG builds the extractor for its configured strategy."""
+        # Only the extractor is built; storage and providers are not booted
+        extractor = GraphRAG._build_entity_extractor(config, model_func=AsyncMock())
 
-        # Verify extractor was initialized correctly
-        assert rag.entity_extractor is not None
-        assert rag.entity_extractor.__class__.__name__ == "DSPyEntityExtractor"
-        assert rag.entity_extraction_func is not None
+        assert extractor.__class__.__name__ == expected_cls_name
+        assert extractor.config.max_gleaning == config.entity_extraction.max_gleaning
 
     @pytest.mark.asyncio
-    async def test_extraction_wrapper_function(self, tmp_path):
+    async def test_extraction_wrapper_function(
+        self, tmp_path, graph_mock_factory, vdb_mock_factory, tokenizer_mock_factory
+    ):
         """Test the extraction wrapper function works correctly."""
         from nano_graphrag.config import StorageConfig
 
         config = GraphRAGConfig(
             storage=StorageConfig(working_dir=str(tmp_path)),
-            entity_extraction=EntityExtractionConfig(strategy="llm")
+            entity_extraction=_LLM_CFG
         )
 
         rag = GraphRAG(config)
@@ -82,20 +61,9 @@ class TestGraphRAGIntegration:
         rag.entity_extractor.initialize = AsyncMock()
 
         # Create mock storage instances
-        mock_graph = MagicMock()
-        mock_graph.upsert_node = AsyncMock()
-        mock_graph.upsert_edge = AsyncMock()
-        mock_graph.execute_document_batch = AsyncMock()  # Add batch execution mock
-        mock_graph.get_node = AsyncMock(return_value=None)
-        mock_graph.has_node = AsyncMock(return_value=False)
-        mock_graph.has_edge = AsyncMock(return_value=False)
-
-        mock_vdb = MagicMock()
-        mock_vdb.upsert = AsyncMock()
-
-        mock_tokenizer = MagicMock()
-        mock_tokenizer.encode = MagicMock(return_value=[1, 2, 3])
-        mock_tokenizer.decode = MagicMock(return_value="decoded text")
+        mock_graph = graph_mock_factory()
+        mock_vdb = vdb_mock_factory()
+        mock_tokenizer = tokenizer_mock_factory()
 
         # Test the wrapper function
         chunks = {"chunk1": {"content": "Test content"}}
@@ -124,26 +92,20 @@ class TestGraphRAGIntegration:
         assert mock_vdb.upsert.called
         assert result == mock_graph
 
-    @pytest.mark.asyncio
-    async def test_strategy_switching(self, tmp_path):
-        """Test switching between extraction strategies."""
+    @pytest.mark.parametrize("strategy_config, expected_cls_name", [
+        (_LLM_CFG, "LLMEntityExtractor"),
+        (_DSPY_CFG, "DSPyEntityExtractor"),
+    ])
+    def test_strategy_selected(self, tmp_path, strategy_config, expected_cls_name):
+        """Test a fully built GraphRAG uses the extractor for its strategy."""
         from nano_graphrag.config import StorageConfig
 
-        # Start with LLM strategy
-        config_llm = GraphRAGConfig(
+        config = GraphRAGConfig(
             storage=StorageConfig(working_dir=str(tmp_path)),
-            entity_extraction=EntityExtractionConfig(strategy="llm")
+            entity_extraction=strategy_config
         )
-        rag_llm = GraphRAG(config_llm)
-        assert rag_llm.entity_extractor.__class__.__name__ == "LLMEntityExtractor"
 
-        # Create new instance with DSPy strategy
-        config_dspy = GraphRAGConfig(
-            storage=StorageConfig(working_dir=str(tmp_path) + "_dspy"),
-            entity_extraction=EntityExtractionConfig(strategy="dspy")
-        )
-        rag_dspy = GraphRAG(config_dspy)
-        assert rag_dspy.entity_extractor.__class__.__name__ == "DSPyEntityExtractor"
+        assert GraphRAG(config).entity_extractor.__class__.__name__ == expected_cls_name
 
     def test_extraction_config_in_graphrag_config(self):
         """Test EntityExtractionConfig is properly integrated."""
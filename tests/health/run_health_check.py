@@ -9,14 +9,27 @@ import sys
 import time
 import asyncio
 import json
+import re
 import shutil
+import sqlite3
+import hashlib
+import gc
+import threading
 import logging
 import xml.etree.ElementTree as ET
+from dataclasses import dataclass
 from pathlib import Path
 from typing import Optional, Tuple, Dict, Any
 from datetime import datetime, timezone
+import numpy as np
 from dotenv import load_dotenv
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 # Configure logging to show INFO level messages
 logging.basicConfig(
     level=logging.INFO,
@@ -30,17 +43,143 @@ from nano_graphrag import GraphRAG, QueryParam
 from nano_graphrag.config import GraphRAGConfig
 
 
+def load_json_file(path: Path) -> Any:
+    """Parse a JSON file, with orjson when it is installed."""
+    data = path.read_bytes()
+    return orjson.loads(data) if ORJSON_AVAILABLE else json.loads(data)
+
+
+# Run history is append-only NDJSON, oldest run first, newest last
+HISTORY_PATH = Path("tests/health/reports/history.ndjson")
+MAX_HISTORY = 100
+# Runs serialize to well under 2KB, so only look at trimming past this size
+HISTORY_COMPACT_BYTES = 2 * MAX_HISTORY * 1024
+
+
+def dump_json_line(obj: Any) -> bytes:
+    """Serialize one NDJSON record, with orjson when it is installed."""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(obj) + b"\n"
+    return json.dumps(obj).encode("utf-8") + b"\n"
+
+
+def read_history() -> list:
+    """Return recorded runs, newest first."""
+    with open(HISTORY_PATH, "rb") as f:
+        lines = [line for line in f if line.strip()]
+    loads = orjson.loads if ORJSON_AVAILABLE else json.loads
+    return [loads(line) for line in reversed(lines)]
+
+
+# Cleaned test corpus, keyed by source mtime and line limit
+TEST_DATA_CACHE_DIR = Path(__file__).parent / ".health" / "cache"
+
+# Blank or whitespace-only lines, including a trailing one without newline
+BLANK_LINES_RE = re.compile(r"^\s*(?:\n|\Z)", re.MULTILINE)
+
+
+@dataclass(frozen=True)
+class EnvSnapshot:
+    """Provider and backend settings, read from the environment once."""
+    provider: str
+    model: str
+    graph_backend: str
+    vector_backend: str
+    kv_backend: str
+    neo4j_url: str
+    neo4j_username: str
+    neo4j_password: str
+    neo4j_database: str
+    neo4j_namespace: Optional[str]
+    qdrant_url: str
+    qdrant_api_key: Optional[str]
+    qdrant_namespace_prefix: Optional[str]
+    redis_url: str
+    redis_password: Optional[str]
+    
+    @classmethod
+    def from_env(cls) -> 'EnvSnapshot':
+        """Create snapshot from environment variables."""
+        return cls(
+            provider=os.getenv("LLM_PROVIDER", "openai"),
+            model=os.getenv("LLM_MODEL", "unknown"),
+            graph_backend=os.getenv("STORAGE_GRAPH_BACKEND", "networkx"),
+            vector_backend=os.getenv("STORAGE_VECTOR_BACKEND", "nano"),
+            kv_backend=os.getenv("STORAGE_KV_BACKEND", "json"),
+            neo4j_url=os.getenv("NEO4J_URL", "neo4j://localhost:7687"),
+            neo4j_username=os.getenv("NEO4J_USERNAME", "neo4j"),
+            neo4j_password=os.getenv("NEO4J_PASSWORD", "neo4j"),
+            neo4j_database=os.getenv("NEO4J_DATABASE", "neo4j"),
+            neo4j_namespace=os.getenv("NEO4J_GRAPH_NAMESPACE"),
+            qdrant_url=os.getenv("QDRANT_URL", "http://localhost:6333"),
+            qdrant_api_key=os.getenv("QDRANT_API_KEY"),
+            qdrant_namespace_prefix=os.getenv("QDRANT_NAMESPACE_PREFIX"),
+            redis_url=os.getenv("REDIS_URL", "redis://localhost:6379"),
+            redis_password=os.getenv("REDIS_PASSWORD")
+        )
+
+
+# One Neo4j driver per run: counting and the final cleanup share its
+# connection pool instead of each paying the connect + auth handshake
+_neo4j_driver = None
+
+
+def get_neo4j_driver(env: EnvSnapshot):
+    """Return the shared Neo4j driver, creating it on first use."""
+    global _neo4j_driver
+    if _neo4j_driver is None:
+        from neo4j import GraphDatabase
+        
+        _neo4j_driver = GraphDatabase.driver(env.neo4j_url, auth=(env.neo4j_username, env.neo4j_password))
+    return _neo4j_driver
+
+
+def close_neo4j_driver():
+    """Close the shared Neo4j driver if one was opened."""
+    global _neo4j_driver
+    if _neo4j_driver is not None:
+        _neo4j_driver.close()
+        _neo4j_driver = None
+
+
+NEO4J_DELETE_BATCH_SIZE = 10000
+
+
+def clear_neo4j(env: EnvSnapshot):
+    """Delete all nodes and relationships, returning the summary counters.
+    
+    Deletes in server-side batches (CALL ... IN TRANSACTIONS, Neo4j 5) so a
+    large graph does not build one huge transaction or hold its locks for
+    the whole delete.
+    """
+    with get_neo4j_driver(env).session(database=env.neo4j_database) as session:
+        result = session.run(
+            f"MATCH (n) CALL {{ WITH n DETACH DELETE n }} IN TRANSACTIONS OF {NEO4J_DELETE_BATCH_SIZE} ROWS"
+        )
+        return result.consume().counters
+
+
 class HealthCheck:
     """End-to-end health check for nano-graphrag."""
     
-    def __init__(self, env_file: Optional[str] = None, working_dir: Optional[str] = None, fresh: bool = False):
+    def __init__(
+        self,
+        env_file: Optional[str] = None,
+        working_dir: Optional[str] = None,
+        fresh: bool = False,
+        reuse_graph: bool = False
+    ):
         """Initialize health check with optional environment file.
         
         Args:
             env_file: Environment configuration file
             working_dir: Persistent working directory (default: .health/dickens)
             fresh: If True, clear working directory before starting
+            reuse_graph: If True, the reload test queries the warm GraphRAG
+                instead of constructing a new one from disk
         """
+        self.reuse_graph = reuse_graph
+        
         if env_file:
             load_dotenv(env_file, override=True)
         
@@ -62,18 +201,38 @@ class HealthCheck:
         # Set working directory in environment for GraphRAG to pick up
         os.environ["STORAGE_WORKING_DIR"] = str(self.working_dir)
         
+        # Settings are read once; later steps use this snapshot
+        self.env = EnvSnapshot.from_env()
+        
+        # Neo4j label for this working dir's graph: the custom namespace from the
+        # environment, or the storage's default GraphRAG_{namespace} format
+        if self.env.neo4j_namespace:
+            self._neo4j_namespace_label = self.env.neo4j_namespace
+        else:
+            clean_namespace = f"{self.working_dir.name}_chunk_entity_relation"
+            clean_namespace = clean_namespace.replace("/", "_").replace("-", "_").replace(".", "_")
+            self._neo4j_namespace_label = f"GraphRAG_{clean_namespace}"
+        
+        # Both counts are answered from Neo4j's counts store (O(1)): a single
+        # label for nodes, and a single label plus the one relationship type
+        # the storage writes (RELATED, always between nodes of the same
+        # namespace) for edges
+        self._neo4j_node_count_query = f"MATCH (n:`{self._neo4j_namespace_label}`) RETURN count(n) as count"
+        self._neo4j_edge_count_query = f"MATCH (:`{self._neo4j_namespace_label}`)-[r:RELATED]->() RETURN count(r) as count"
+        
         # Initialize results tracking
         self.results: Dict[str, Any] = {
             "timestamp": datetime.now(timezone.utc).isoformat(),
-            "provider": os.environ.get("LLM_PROVIDER", "openai"),
-            "model": os.environ.get("LLM_MODEL", "unknown"),
+            "provider": self.env.provider,
+            "model": self.env.model,
             "storage": {
-                "vector_backend": os.environ.get("STORAGE_VECTOR_BACKEND", "nano"),
-                "graph_backend": os.environ.get("STORAGE_GRAPH_BACKEND", "networkx"),
-                "kv_backend": os.environ.get("STORAGE_KV_BACKEND", "json"),
+                "vector_backend": self.env.vector_backend,
+                "graph_backend": self.env.graph_backend,
+                "kv_backend": self.env.kv_backend,
             },
             "status": "running",
             "timings": {},
+            "timings_ns": {},
             "counts": {
                 "nodes": 0,
                 "edges": 0,
@@ -92,6 +251,16 @@ class HealthCheck:
             os.environ["EMBEDDING_MAX_CONCURRENT"] = "8"
         if "LLM_CACHE_ENABLED" not in os.environ:
             os.environ["LLM_CACHE_ENABLED"] = "true"  # Enable caching for repeated queries
+        if "EMBEDDING_CACHE_ENABLED" not in os.environ:
+            os.environ["EMBEDDING_CACHE_ENABLED"] = "false"  # Opt in to reuse embeddings across runs
+        if "EMBEDDING_CACHE_PATH" not in os.environ:
+            os.environ["EMBEDDING_CACHE_PATH"] = str(self.working_dir / "embedding_cache.sqlite")
+        
+        self._embedding_cache: Optional[sqlite3.Connection] = None
+        # Guards the shared connection across to_thread workers and wrapped graphs
+        self._embedding_cache_lock = threading.Lock()
+        # One-slot ((mtime_ns, size), (nodes, edges)) cache for count_graph_elements
+        self._graphml_count_cache: Optional[Tuple[Tuple[int, int], Tuple[int, int]]] = None
         
     def cleanup(self, keep_persistent: bool = True):
         """Clean up working directory.
@@ -104,69 +273,152 @@ class HealthCheck:
             shutil.rmtree(self.working_dir)
             print(f"Cleaned up: {self.working_dir}")
     
+    def _record_timing(self, name: str, elapsed_ns: int) -> float:
+        """Store a monotonic duration as raw ns and as float seconds; return seconds."""
+        self.results["timings_ns"][name] = elapsed_ns
+        elapsed = elapsed_ns / 1e9
+        self.results["timings"][name] = elapsed
+        return elapsed
+    
+    def _wrap_embedding_with_cache(self, graph: GraphRAG) -> None:
+        """Serve repeated embedding requests from a SQLite cache.
+        
+        Wraps the embedding provider rather than graph.embedding_func, since
+        the vector storages hold their own reference to the latter. Vectors
+        are keyed by sha256 of model, dimensions, endpoint and text and stored
+        as float32 blobs. SQLite work runs off the event loop.
+        """
+        if os.environ.get("EMBEDDING_CACHE_ENABLED", "false").lower() != "true":
+            return
+        
+        if self._embedding_cache is None:
+            self._embedding_cache = sqlite3.connect(
+                os.environ["EMBEDDING_CACHE_PATH"], check_same_thread=False
+            )
+            self._embedding_cache.execute("PRAGMA journal_mode=WAL")
+            self._embedding_cache.execute("PRAGMA synchronous=NORMAL")
+            self._embedding_cache.execute(
+                "CREATE TABLE IF NOT EXISTS embeddings (key TEXT PRIMARY KEY, vector BLOB NOT NULL)"
+            )
+        db = self._embedding_cache
+        db_lock = self._embedding_cache_lock
+        
+        provider = graph.embedding_provider
+        embed = provider.embed
+        key_prefix = (
+            f"{provider.model}\0{getattr(provider, 'embedding_dim', '')}"
+            f"\0{getattr(provider, 'base_url', None) or ''}\0"
+        )
+        
+        def lookup(keys):
+            cached = {}
+            with db_lock:
+                for start in range(0, len(keys), 500):  # Stay under SQLite's variable limit
+                    batch = keys[start:start + 500]
+                    rows = db.execute(
+                        f"SELECT key, vector FROM embeddings WHERE key IN ({','.join('?' * len(batch))})",
+                        batch
+                    )
+                    cached.update((key, np.frombuffer(vector, dtype=np.float32)) for key, vector in rows)
+            return cached
+        
+        def store(rows):
+            with db_lock:
+                db.executemany("INSERT OR IGNORE INTO embeddings (key, vector) VALUES (?, ?)", rows)
+                db.commit()
+        
+        async def cached_embed(texts, *args, **kwargs):
+            if not texts:
+                return await embed(texts, *args, **kwargs)
+            
+            keys = [
+                hashlib.sha256(f"{key_prefix}{text}".encode("utf-8")).hexdigest()
+                for text in texts
+            ]
+            cached = await asyncio.to_thread(lookup, keys)
+            
+            misses = [i for i, key in enumerate(keys) if key not in cached]
+            usage = {"prompt_tokens": 0, "total_tokens": 0}
+            if misses:
+                response = await embed([texts[i] for i in misses], *args, **kwargs)
+                usage = response.get("usage", usage)
+                vectors = np.asarray(response["embeddings"], dtype=np.float32)
+                await asyncio.to_thread(
+                    store, [(keys[i], vector.tobytes()) for i, vector in zip(misses, vectors)]
+                )
+                cached.update((keys[i], vector) for i, vector in zip(misses, vectors))
+            
+            embeddings = np.stack([cached[key] for key in keys])
+            return {
+                "embeddings": embeddings,
+                "dimensions": embeddings.shape[1],
+                "model": provider.model,
+                "usage": usage
+            }
+        
+        provider.embed = cached_embed
+    
     def load_test_data(self) -> str:
-        """Load test data - using smaller subset for faster testing."""
+        """Load test data - using smaller subset for faster testing.
+        
+        The cleaned text is cached under tests/health/.health/cache, keyed by
+        the source file's mtime and the line limit, so repeat runs read it back
+        directly. Entries for an older version of the source are removed.
+        """
         test_data_path = Path(__file__).parent.parent / "mock_data.txt"
         if not test_data_path.exists():
             raise FileNotFoundError(f"Test data not found: {test_data_path}")
         
-        with open(test_data_path, "r", encoding="utf-8") as f:
-            lines = f.readlines()
-        
-        # Remove empty lines
-        lines = [line for line in lines if line.strip()]
-        
         # Truncate if TEST_DATA_LINES is set (for faster testing)
+        max_lines = 0
         test_data_lines = os.environ.get("TEST_DATA_LINES")
         if test_data_lines:
             try:
                 max_lines = int(test_data_lines)
-                if max_lines > 0:
-                    lines = lines[:max_lines]
-                    print(f"Using first {max_lines} non-empty lines for testing")
             except ValueError:
                 print(f"Warning: Invalid TEST_DATA_LINES value: {test_data_lines}")
+        if max_lines > 0:
+            print(f"Using first {max_lines} non-empty lines for testing")
+        
+        source_mtime = test_data_path.stat().st_mtime_ns
+        cache_path = TEST_DATA_CACHE_DIR / f"mock_{source_mtime}_{max_lines if max_lines > 0 else 'all'}.txt"
+        if cache_path.exists():
+            return cache_path.read_text(encoding="utf-8")
+        
+        raw = test_data_path.read_text(encoding="utf-8")
+        
+        # Remove empty (or whitespace-only) lines
+        text = BLANK_LINES_RE.sub("", raw)
+        
+        if max_lines > 0:
+            parts = text.split("\n", max_lines)
+            if len(parts) > max_lines:
+                text = "\n".join(parts[:max_lines]) + "\n"
         
-        return "".join(lines)
+        try:
+            TEST_DATA_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+            for stale in TEST_DATA_CACHE_DIR.glob("mock_*.txt"):
+                if not stale.name.startswith(f"mock_{source_mtime}_"):
+                    stale.unlink(missing_ok=True)
+            cache_path.write_text(text, encoding="utf-8")
+        except OSError as e:
+            print(f"Warning: Could not cache test data: {e}")
+        
+        return text
     
     def count_graph_elements(self) -> Tuple[int, int]:
         """Count nodes and edges in the generated graph."""
         # Check if we're using Neo4j backend
-        graph_backend = os.environ.get("STORAGE_GRAPH_BACKEND", "networkx")
-        
-        if graph_backend == "neo4j":
+        if self.env.graph_backend == "neo4j":
             # Count nodes and edges from Neo4j
             try:
-                from neo4j import GraphDatabase
-                
-                neo4j_url = os.environ.get("NEO4J_URL", "neo4j://localhost:7687")
-                neo4j_username = os.environ.get("NEO4J_USERNAME", "neo4j")
-                neo4j_password = os.environ.get("NEO4J_PASSWORD", "neo4j")
-                neo4j_database = os.environ.get("NEO4J_DATABASE", "neo4j")
-                
-                driver = GraphDatabase.driver(neo4j_url, auth=(neo4j_username, neo4j_password))
-                
-                with driver.session(database=neo4j_database) as session:
-                    # Count all nodes with the namespace label
-                    # Check for custom namespace from environment
-                    custom_namespace = os.environ.get("NEO4J_GRAPH_NAMESPACE")
-                    if custom_namespace:
-                        namespace_label = custom_namespace
-                    else:
-                        # Default format: GraphRAG_{namespace}
-                        clean_namespace = f"{self.working_dir.name}_chunk_entity_relation"
-                        clean_namespace = clean_namespace.replace("/", "_").replace("-", "_").replace(".", "_")
-                        namespace_label = f"GraphRAG_{clean_namespace}"
-                    
-                    # Count nodes
-                    result = session.run(f"MATCH (n:`{namespace_label}`) RETURN count(n) as count")
+                with get_neo4j_driver(self.env).session(database=self.env.neo4j_database) as session:
+                    result = session.run(self._neo4j_node_count_query)
                     node_count = result.single()["count"]
                     
-                    # Count relationships
-                    result = session.run(f"MATCH (:`{namespace_label}`)-[r]->(:`{namespace_label}`) RETURN count(r) as count")
+                    result = session.run(self._neo4j_edge_count_query)
                     edge_count = result.single()["count"]
                     
-                driver.close()
                 return node_count, edge_count
                 
             except Exception as e:
@@ -175,29 +427,65 @@ class HealthCheck:
         else:
             # Default: look for GraphML file
             graphml_path = self.working_dir / "graph_chunk_entity_relation.graphml"
-            if not graphml_path.exists():
+            try:
+                stat = graphml_path.stat()
+            except FileNotFoundError:
                 return 0, 0
             
+            # The file only changes when the graph is rewritten, so a repeat
+            # call against the same (mtime, size) reuses the last count
+            cache_key = (stat.st_mtime_ns, stat.st_size)
+            if self._graphml_count_cache is not None and self._graphml_count_cache[0] == cache_key:
+                return self._graphml_count_cache[1]
+            
             try:
-                tree = ET.parse(graphml_path)
-                root = tree.getroot()
+                # Stream the file and count as we go; tags carry the GraphML
+                # namespace ("{...}node"), so match on the suffix
+                node_count = edge_count = 0
+                for _, element in ET.iterparse(str(graphml_path), events=("end",)):
+                    tag = element.tag
+                    if tag.endswith('}node'):
+                        node_count += 1
+                    elif tag.endswith('}edge'):
+                        edge_count += 1
+                    element.clear()
                 
-                # GraphML namespace
-                ns = {'g': 'http://graphml.graphdrawing.org/xmlns'}
-                
-                # Count nodes and edges
-                nodes = root.findall('.//g:node', ns)
-                edges = root.findall('.//g:edge', ns)
-                
-                return len(nodes), len(edges)
+                self._graphml_count_cache = (cache_key, (node_count, edge_count))
+                return node_count, edge_count
             except Exception as e:
                 print(f"Error parsing GraphML: {e}")
                 return 0, 0
     
+    def _describe_artifacts(self, artifacts: list) -> list:
+        """Report size or file count for each artifact in the working dir."""
+        # One directory read instead of an exists/is_file/stat per artifact
+        with os.scandir(self.working_dir) as it:
+            entries = {entry.name: entry for entry in it}
+        
+        lines = []
+        for artifact in artifacts:
+            entry = entries.get(artifact)
+            if entry is None:
+                lines.append(f"✗ {artifact}: Not found")
+            elif entry.is_file():
+                lines.append(f"✓ {artifact}: {entry.stat().st_size:,} bytes")
+            else:
+                # Directory - count files
+                with os.scandir(entry.path) as it:
+                    file_count = sum(1 for _ in it)
+                lines.append(f"✓ {artifact}: {file_count} files")
+        return lines
+    
+    def _count_kv_store(self, filename: str) -> int:
+        """Return the number of records in a JSON KV store, or 0 if unreadable."""
+        try:
+            return len(load_json_file(self.working_dir / filename))
+        except Exception:
+            return 0
+    
     async def test_insert_and_build(self, graph: GraphRAG, text: str) -> bool:
         """Test document insertion and graph building."""
         print("\n=== Testing Insert and Build ===")
-        start_time = time.time()
         
         try:
             # Insert document with timeout
@@ -209,7 +497,7 @@ class HealthCheck:
             print(f"Max gleaning: {graph.config.entity_extraction.max_gleaning}")
             print(f"Document size: {len(text):,} characters")
             
-            start_time = time.time()
+            start_ns = time.perf_counter_ns()
             
             print("Starting async insert task...")
             # Get timeout from environment or use default
@@ -228,49 +516,34 @@ class HealthCheck:
                 "vdb_chunks.json"
             ]
             
-            for artifact in artifacts:
-                path = self.working_dir / artifact
-                if path.exists():
-                    if path.is_file():
-                        size = path.stat().st_size
-                        print(f"✓ {artifact}: {size:,} bytes")
-                    else:
-                        # Directory - count files
-                        files = list(path.glob("*"))
-                        print(f"✓ {artifact}: {len(files)} files")
-                else:
-                    print(f"✗ {artifact}: Not found")
+            # The post-insert probes are independent blocking reads: run them in
+            # worker threads together, off the event loop (slow on NFS/FUSE mounts)
+            artifact_lines, (nodes, edges), communities, chunks = await asyncio.gather(
+                asyncio.to_thread(self._describe_artifacts, artifacts),
+                asyncio.to_thread(self.count_graph_elements),
+                asyncio.to_thread(self._count_kv_store, "kv_store_community_reports.json"),
+                asyncio.to_thread(self._count_kv_store, "kv_store_text_chunks.json")
+            )
             
-            # Count graph elements
-            nodes, edges = self.count_graph_elements()
+            for line in artifact_lines:
+                print(line)
             print(f"Graph statistics: {nodes} nodes, {edges} edges")
             
             # Count communities and chunks for metrics
-            try:
-                with open(self.working_dir / "kv_store_community_reports.json") as f:
-                    reports = json.load(f)
-                    self.results["counts"]["communities"] = len(reports)
-                    print(f"Communities: {len(reports)}")
-            except Exception:
-                self.results["counts"]["communities"] = 0
-            
-            try:
-                with open(self.working_dir / "kv_store_text_chunks.json") as f:
-                    chunks = json.load(f)
-                    self.results["counts"]["chunks"] = len(chunks)
-                    print(f"Chunks: {len(chunks)}")
-            except Exception:
-                self.results["counts"]["chunks"] = 0
+            self.results["counts"]["communities"] = communities
+            self.results["counts"]["chunks"] = chunks
+            print(f"Communities: {communities}")
+            print(f"Chunks: {chunks}")
             
-            elapsed = time.time() - start_time
-            print(f"Insert completed in {elapsed:.1f} seconds")
+            elapsed_ns = time.perf_counter_ns() - start_ns
+            print(f"Insert completed in {elapsed_ns / 1e9:.1f} seconds")
             
             # Validate graph was built
             assert nodes > 10, f"Expected >10 nodes, got {nodes}"
             assert edges > 5, f"Expected >5 edges, got {edges}"
             
             # Store results
-            self.results["timings"]["insert"] = elapsed
+            self._record_timing("insert", elapsed_ns)
             self.results["counts"]["nodes"] = nodes
             self.results["counts"]["edges"] = edges
             self.results["tests"]["insert"] = "passed"
@@ -296,76 +569,102 @@ class HealthCheck:
             ("What happens on Christmas Eve?", "naive")
         ]
         
-        all_passed = True
+        # Queries are independent, so run them together; bound concurrency for
+        # local LLM backends that cannot serve several requests at once
+        semaphore = asyncio.Semaphore(int(os.environ.get("HEALTH_QUERY_CONCURRENCY", "3")))
         
-        for query_text, mode in queries:
-            try:
+        async def timed_query(query_text: str, mode: str) -> Tuple[Optional[str], int]:
+            async with semaphore:
                 print(f"\nQuery ({mode}): {query_text[:50]}...")
-                
-                param = QueryParam(mode=mode)
-                start_time = time.time()
-                
-                result = await graph.aquery(query_text, param=param)
-                
-                elapsed = time.time() - start_time
-                response_len = len(result) if result else 0
-                
-                print(f"Response length: {response_len} chars")
-                print(f"Query time: {elapsed:.1f} seconds")
-                
-                # Validate response
-                # Check for default "no context" response
-                if result and "No context" in result:
-                    print(f"Warning: Got default 'no context' response for {mode} query")
-                    print(f"This likely means the graph wasn't built properly")
-                    all_passed = False
-                    continue
-                
-                # Store timing
-                self.results["timings"][f"{mode}_query"] = elapsed
-                
-                # Validate response (more lenient)
-                min_expected = 100 if mode == "naive" else 200
-                if response_len < min_expected:
-                    print(f"Warning: Response too short for {mode} (expected >{min_expected}, got {response_len})")
-                    self.results["tests"][f"{mode}_query"] = "failed"
-                    all_passed = False
-                else:
-                    print(f"✓ {mode.capitalize()} query passed")
-                    self.results["tests"][f"{mode}_query"] = "passed"
-                
-                # Show preview of response
-                if result:
-                    preview = result[:200] + "..." if len(result) > 200 else result
-                    print(f"Preview: {preview}")
-                
-            except Exception as e:
-                print(f"Query ({mode}) failed: {e}")
+                start_ns = time.perf_counter_ns()
+                result = await graph.aquery(query_text, param=QueryParam(mode=mode))
+                return result, time.perf_counter_ns() - start_ns
+        
+        outcomes = await asyncio.gather(
+            *(timed_query(query_text, mode) for query_text, mode in queries),
+            return_exceptions=True
+        )
+        
+        all_passed = True
+        
+        for (query_text, mode), outcome in zip(queries, outcomes):
+            if isinstance(outcome, Exception):
+                print(f"\nQuery ({mode}) failed: {outcome}")
                 import traceback
                 print("Traceback:")
-                traceback.print_exc()
-                self.results["errors"].append(f"{mode} query failed: {str(e)}")
+                traceback.print_exception(type(outcome), outcome, outcome.__traceback__)
+                self.results["errors"].append(f"{mode} query failed: {str(outcome)}")
                 self.results["tests"][f"{mode}_query"] = "failed"
                 all_passed = False
                 continue
+            
+            result, elapsed_ns = outcome
+            response_len = len(result) if result else 0
+            
+            print(f"\nQuery ({mode}) response length: {response_len} chars")
+            print(f"Query time: {elapsed_ns / 1e9:.1f} seconds")
+            
+            # Validate response
+            # Check for default "no context" response
+            if result and "No context" in result:
+                print(f"Warning: Got default 'no context' response for {mode} query")
+                print(f"This likely means the graph wasn't built properly")
+                all_passed = False
+                continue
+            
+            # Store timing
+            self._record_timing(f"{mode}_query", elapsed_ns)
+            
+            # Validate response (more lenient)
+            min_expected = 100 if mode == "naive" else 200
+            if response_len < min_expected:
+                print(f"Warning: Response too short for {mode} (expected >{min_expected}, got {response_len})")
+                self.results["tests"][f"{mode}_query"] = "failed"
+                all_passed = False
+            else:
+                print(f"✓ {mode.capitalize()} query passed")
+                self.results["tests"][f"{mode}_query"] = "passed"
+            
+            # Show preview of response
+            if result:
+                preview = result[:200] + "..." if len(result) > 200 else result
+                print(f"Preview: {preview}")
         
         return all_passed
     
-    async def test_reload(self) -> bool:
-        """Test reloading from cached state."""
+    def _fresh_graph(self) -> GraphRAG:
+        """Build a GraphRAG from the environment, with the embedding cache attached."""
+        graph = GraphRAG(config=GraphRAGConfig.from_env())
+        self._wrap_embedding_with_cache(graph)
+        return graph
+    
+    async def test_reload(self, graph: Optional[GraphRAG] = None) -> bool:
+        """Test reloading from cached state.
+        
+        Args:
+            graph: Warm instance to query instead of a cold reload from disk
+        """
         print("\n=== Testing Reload from Cache ===")
         
         try:
-            # Create new instance from same working dir - uses existing config from env
-            graph = GraphRAG(config=GraphRAGConfig.from_env())
+            if graph is None:
+                # Create new instance from same working dir - uses existing config from env.
+                # Startup is timed on its own so the reload timing covers only the query
+                init_start_ns = time.perf_counter_ns()
+                graph = self._fresh_graph()
+                init_elapsed = self._record_timing("reload_init", time.perf_counter_ns() - init_start_ns)
+                print(f"Reload init: {init_elapsed:.1f} seconds")
+            else:
+                print("Reusing warm GraphRAG instance (cold init skipped)")
             
             # Quick global query to verify cached state works
             query = "Summarize the story in one sentence."
             param = QueryParam(mode="global")
             
-            start_time = time.time()
+            start_ns = time.perf_counter_ns()
             result = await graph.aquery(query, param=param)
-            elapsed = time.time() - start_time
+            elapsed_ns = time.perf_counter_ns() - start_ns
+            elapsed = elapsed_ns / 1e9
             
             response_len = len(result) if result else 0
             print(f"Reload query response: {response_len} chars in {elapsed:.1f} seconds")
@@ -376,7 +675,7 @@ class HealthCheck:
                 return False
             
             # Store timing
-            self.results["timings"]["reload"] = elapsed
+            self._record_timing("reload", elapsed_ns)
             
             # Reload should be much faster than initial insert
             insert_time = self.results["timings"].get("insert", 300)
@@ -399,37 +698,119 @@ class HealthCheck:
             return False
     
     def save_report(self):
-        """Save JSON report with test results, preserving history."""
-        report_dir = Path("tests/health/reports")
-        report_dir.mkdir(parents=True, exist_ok=True)
-        report_path = report_dir / "latest.json"
-        
-        # Load existing history
-        history = []
-        if report_path.exists():
-            try:
-                with open(report_path) as f:
-                    existing = json.load(f)
-                    # Handle both old format (single dict) and new format (array)
-                    if isinstance(existing, dict):
-                        history = [existing]
-                    else:
-                        history = existing
-            except Exception as e:
-                print(f"Warning: Could not load existing history: {e}")
+        """Append this run to the NDJSON history, trimming it when it grows large."""
+        HISTORY_PATH.parent.mkdir(parents=True, exist_ok=True)
         
-        # Add current run at the beginning
-        history.insert(0, self.results)
+        with open(HISTORY_PATH, "ab") as f:
+            f.write(dump_json_line(self.results))
         
-        # Keep only last 100 runs to prevent unbounded growth
-        MAX_HISTORY = 100
-        history = history[:MAX_HISTORY]
+        # Appends are O(1); only rewrite once the file is well past MAX_HISTORY runs
+        if HISTORY_PATH.stat().st_size > HISTORY_COMPACT_BYTES:
+            with open(HISTORY_PATH, "rb") as f:
+                lines = [line for line in f if line.strip()]
+            if len(lines) > MAX_HISTORY:
+                tmp_path = HISTORY_PATH.with_suffix(".tmp")
+                with open(tmp_path, "wb") as f:
+                    f.writelines(lines[-MAX_HISTORY:])
+                os.replace(tmp_path, HISTORY_PATH)
         
-        # Save updated history
-        with open(report_path, "w") as f:
-            json.dump(history, f, indent=2)
-        
-        print(f"\n📊 Report saved to {report_path} (keeping {len(history)} runs)")
+        print(f"\n📊 Report saved to {HISTORY_PATH}")
+    
+    async def _cleanup_neo4j(self):
+        """Delete the run's Neo4j graph in a worker thread."""
+        try:
+            counters = await asyncio.to_thread(clear_neo4j, self.env)
+            if counters.nodes_deleted > 0:
+                print(f"\n🧹 Cleaned up Neo4j: {counters.nodes_deleted} nodes, {counters.relationships_deleted} relationships")
+        except Exception as e:
+            print(f"Warning: Could not clean up Neo4j: {e}")
+        finally:
+            close_neo4j_driver()
+    
+    async def _cleanup_qdrant(self):
+        """Delete this working dir's Qdrant collections."""
+        try:
+            from qdrant_client import AsyncQdrantClient
+
+            # Fresh client owned by this method, on the loop that is still running
+            client = AsyncQdrantClient(url=self.env.qdrant_url, api_key=self.env.qdrant_api_key)
+
+            # Get the namespace prefix
+            namespace_prefix = self.env.qdrant_namespace_prefix
+            if not namespace_prefix:
+                # Use working directory basename as prefix
+                namespace_prefix = self.working_dir.name
+
+            # Delete collections with our namespace prefix
+            collections_to_delete = [
+                f"{namespace_prefix}_entities",
+                f"{namespace_prefix}_chunks"
+            ]
+
+            try:
+                # List collections once, then delete the ones present concurrently
+                existing = {c.name for c in (await client.get_collections()).collections}
+                targets = [name for name in collections_to_delete if name in existing]
+                outcomes = await asyncio.gather(
+                    *(client.delete_collection(name) for name in targets),
+                    return_exceptions=True
+                )
+            finally:
+                await client.close()
+
+            deleted_count = 0
+            for collection_name, outcome in zip(targets, outcomes):
+                if isinstance(outcome, Exception):
+                    print(f"Warning: Could not delete Qdrant collection {collection_name}: {outcome}")
+                else:
+                    deleted_count += 1
+
+            if deleted_count > 0:
+                print(f"\n🧹 Cleaned up Qdrant: {deleted_count} collections deleted")
+
+        except Exception as e:
+            print(f"Warning: Could not clean up Qdrant: {e}")
+    
+    def _cleanup_redis(self):
+        """Delete nano_graphrag keys from Redis (blocking client, run in a thread)."""
+        try:
+            import redis
+
+            # Use synchronous client for cleanup
+            client = redis.from_url(self.env.redis_url, password=self.env.redis_password, decode_responses=False)
+
+            # Get all keys with nano_graphrag prefix for all namespaces
+            # Common namespaces used in nano-graphrag
+            namespaces = ["full_docs", "text_chunks", "community_reports", "llm_response_cache"]
+
+            total_deleted = 0
+            for namespace in namespaces:
+                # Pattern: nano_graphrag:{namespace}:*
+                pattern = f"nano_graphrag:{namespace}:*"
+
+                # Use SCAN to avoid blocking Redis
+                cursor = 0
+                keys_to_delete = []
+                while True:
+                    cursor, keys = client.scan(cursor, match=pattern, count=100)
+                    keys_to_delete.extend(keys)
+                    if cursor == 0:
+                        break
+
+                # Delete keys in batches
+                if keys_to_delete:
+                    for i in range(0, len(keys_to_delete), 1000):
+                        batch = keys_to_delete[i:i+1000]
+                        deleted = client.delete(*batch)
+                        total_deleted += deleted
+
+            if total_deleted > 0:
+                print(f"\n🧹 Cleaned up Redis: {total_deleted} keys deleted")
+
+            client.close()
+
+        except Exception as e:
+            print(f"Warning: Could not clean up Redis: {e}")
     
     async def run(self) -> bool:
         """Run complete health check."""
@@ -437,7 +818,7 @@ class HealthCheck:
         print("NANO-GRAPHRAG HEALTH CHECK")
         print("=" * 60)
         
-        overall_start = time.time()
+        overall_start_ns = time.perf_counter_ns()
         
         try:
             # Load test data
@@ -447,8 +828,8 @@ class HealthCheck:
             
             # Initialize GraphRAG using only environment configuration
             # No function injection - GraphRAG will use env vars for LLM/embedding config
-            config = GraphRAGConfig.from_env()
-            graph = GraphRAG(config=config)
+            graph = self._fresh_graph()
+            config = graph.config
             
             # Print storage configuration
             print(f"\nStorage Configuration:")
@@ -475,14 +856,21 @@ class HealthCheck:
             tests_passed.append(await self.test_query(graph))
             
             # Test 3: Reload from cache
-            tests_passed.append(await self.test_reload())
+            if self.reuse_graph:
+                tests_passed.append(await self.test_reload(graph))
+            else:
+                # Release the first instance so reload rebuilds from persisted state alone
+                del graph
+                gc.collect()
+                tests_passed.append(await self.test_reload())
             
             # Summary
             print("\n" + "=" * 60)
             print("HEALTH CHECK SUMMARY")
             print("=" * 60)
             
-            total_time = time.time() - overall_start
+            total_ns = time.perf_counter_ns() - overall_start_ns
+            total_time = total_ns / 1e9
             passed = sum(tests_passed)
             total = len(tests_passed)
             
@@ -496,7 +884,7 @@ class HealthCheck:
             
             success = passed == total
             self.results["status"] = "passed" if success else "failed"
-            self.results["timings"]["total"] = total_time
+            self._record_timing("total", total_ns)
             
             # Save JSON report
             self.save_report()
@@ -515,128 +903,33 @@ class HealthCheck:
             return False
         
         finally:
-            # Clean up Neo4j if we're using it
-            if os.environ.get("STORAGE_GRAPH_BACKEND") == "neo4j":
-                try:
-                    from neo4j import GraphDatabase
-                    neo4j_url = os.environ.get("NEO4J_URL", "neo4j://localhost:7687")
-                    neo4j_username = os.environ.get("NEO4J_USERNAME", "neo4j")
-                    neo4j_password = os.environ.get("NEO4J_PASSWORD", "neo4j")
-                    neo4j_database = os.environ.get("NEO4J_DATABASE", "neo4j")
-                    
-                    driver = GraphDatabase.driver(neo4j_url, auth=(neo4j_username, neo4j_password))
-                    with driver.session(database=neo4j_database) as session:
-                        # Delete all nodes and relationships
-                        result = session.run("MATCH (n) DETACH DELETE n")
-                        summary = result.consume()
-                        if summary.counters.nodes_deleted > 0:
-                            print(f"\n🧹 Cleaned up Neo4j: {summary.counters.nodes_deleted} nodes, {summary.counters.relationships_deleted} relationships")
-                    driver.close()
-                except Exception as e:
-                    print(f"Warning: Could not clean up Neo4j: {e}")
-            
-            # Clean up Qdrant if we're using it
-            if os.environ.get("STORAGE_VECTOR_BACKEND") == "qdrant":
-                try:
-                    from qdrant_client import QdrantClient
-
-                    qdrant_url = os.environ.get("QDRANT_URL", "http://localhost:6333")
-                    qdrant_api_key = os.environ.get("QDRANT_API_KEY", None)
-
-                    # Use synchronous client for cleanup to avoid event loop issues
-                    client = QdrantClient(url=qdrant_url, api_key=qdrant_api_key)
-
-                    # Get the namespace prefix
-                    namespace_prefix = os.environ.get("QDRANT_NAMESPACE_PREFIX")
-                    if not namespace_prefix:
-                        # Use working directory basename as prefix
-                        namespace_prefix = self.working_dir.name
-
-                    # Delete collections with our namespace prefix
-                    collections_to_delete = [
-                        f"{namespace_prefix}_entities",
-                        f"{namespace_prefix}_chunks"
-                    ]
-
-                    deleted_count = 0
-                    for collection_name in collections_to_delete:
-                        try:
-                            # Check if collection exists first
-                            collections = client.get_collections()
-                            if any(c.name == collection_name for c in collections.collections):
-                                client.delete_collection(collection_name)
-                                deleted_count += 1
-                        except Exception as e:
-                            print(f"Warning: Could not delete Qdrant collection {collection_name}: {e}")
-
-                    if deleted_count > 0:
-                        print(f"\n🧹 Cleaned up Qdrant: {deleted_count} collections deleted")
-
-                    client.close()
-
-                except Exception as e:
-                    print(f"Warning: Could not clean up Qdrant: {e}")
-
-            # Clean up Redis if we're using it
-            if os.environ.get("STORAGE_KV_BACKEND") == "redis":
-                try:
-                    import redis
-
-                    redis_url = os.environ.get("REDIS_URL", "redis://localhost:6379")
-                    redis_password = os.environ.get("REDIS_PASSWORD", None)
-
-                    # Use synchronous client for cleanup
-                    client = redis.from_url(redis_url, password=redis_password, decode_responses=False)
-
-                    # Get all keys with nano_graphrag prefix for all namespaces
-                    # Common namespaces used in nano-graphrag
-                    namespaces = ["full_docs", "text_chunks", "community_reports", "llm_response_cache"]
-
-                    total_deleted = 0
-                    for namespace in namespaces:
-                        # Pattern: nano_graphrag:{namespace}:*
-                        pattern = f"nano_graphrag:{namespace}:*"
-
-                        # Use SCAN to avoid blocking Redis
-                        cursor = 0
-                        keys_to_delete = []
-                        while True:
-                            cursor, keys = client.scan(cursor, match=pattern, count=100)
-                            keys_to_delete.extend(keys)
-                            if cursor == 0:
-                                break
-
-                        # Delete keys in batches
-                        if keys_to_delete:
-                            for i in range(0, len(keys_to_delete), 1000):
-                                batch = keys_to_delete[i:i+1000]
-                                deleted = client.delete(*batch)
-                                total_deleted += deleted
-
-                    if total_deleted > 0:
-                        print(f"\n🧹 Cleaned up Redis: {total_deleted} keys deleted")
-
-                    client.close()
-
-                except Exception as e:
-                    print(f"Warning: Could not clean up Redis: {e}")
-
+            if self._embedding_cache is not None:
+                self._embedding_cache.close()
+                self._embedding_cache = None
+            
+            # Backend cleanups are independent: run them together, with the
+            # blocking clients in worker threads so the event loop stays free
+            cleanups = []
+            if self.env.graph_backend == "neo4j":
+                cleanups.append(self._cleanup_neo4j())
+            if self.env.vector_backend == "qdrant":
+                cleanups.append(self._cleanup_qdrant())
+            if self.env.kv_backend == "redis":
+                cleanups.append(asyncio.to_thread(self._cleanup_redis))
+            await asyncio.gather(*cleanups)
+            
             # Keep persistent directory by default
             self.cleanup(keep_persistent=True)
 
 
 def print_history_summary():
     """Print a summary of historical health check runs."""
-    report_path = Path("tests/health/reports/latest.json")
-    if not report_path.exists():
+    if not HISTORY_PATH.exists():
         print("No history found")
         return
     
     try:
-        with open(report_path) as f:
-            history = json.load(f)
-            if isinstance(history, dict):
-                history = [history]
+        history = read_history()
         
         print("\n=== Health Check History ===")
         print(f"Total runs: {len(history)}")
@@ -703,6 +996,11 @@ async def main():
         default=".health/dickens",
         help="Persistent working directory (default: .health/dickens)"
     )
+    parser.add_argument(
+        "--skip-reload-cold-init",
+        action="store_true",
+        help="Reuse the warm GraphRAG for the reload test instead of reconstructing it"
+    )
     parser.add_argument(
         "--history",
         action="store_true",
@@ -729,7 +1027,12 @@ async def main():
             env_file = None
     
     # Run health check
-    health_check = HealthCheck(env_file, working_dir=args.workdir, fresh=args.fresh)
+    health_check = HealthCheck(
+        env_file,
+        working_dir=args.workdir,
+        fresh=args.fresh,
+        reuse_graph=args.skip_reload_cold_init
+    )
     success = await health_check.run()
     
     # Exit with appropriate code
@@ -737,4 +1040,10 @@ async def main():
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
\ No newline at end of file
+    # uvloop trims per-await overhead when installed; the stdlib loop otherwise
+    try:
+        import uvloop
+    except ImportError:
+        asyncio.run(main())
+    else:
+        uvloop.run(main())
\ No newline at end of file
@@ -25,16 +25,16 @@ async def test_streaming_with_per_chunk_timeout_success():
     # Create a mock stream object
     class MockStream:
         async def __aiter__(self):
-            """Simulate slow streaming with 0.5s between chunks."""
+            """Simulate slow streaming with 20ms between chunks."""
             for event in mock_events:
-                await asyncio.sleep(0.5)  # Simulate network delay between chunks
+                await asyncio.sleep(0.02)  # Simulate network delay between chunks
                 yield event
 
-    # Create provider with short idle timeout (1 second)
+    # Create provider with short idle timeout (100ms)
     provider = OpenAIResponsesProvider(
         model="gpt-5-mini",
         api_key="test-key",
-        idle_timeout=1.0  # 1 second idle timeout
+        idle_timeout=0.1  # 100ms idle timeout
     )
 
     # Mock the client's responses.create to return our mock stream
@@ -49,7 +49,7 @@ async def test_streaming_with_per_chunk_timeout_success():
             chunks.append(chunk["text"])
 
         # Verify we got all chunks despite total time > idle_timeout
-        # Total time is ~3 seconds (6 chunks * 0.5s) but no single gap > 1s
+        # Total time is ~140ms (7 chunks * 20ms) but no single gap > 100ms
         assert chunks == ["This is ", "a very ", "long ", "generation ", "that takes ", "time.", ""]
 
         # Verify the API was called correctly
@@ -72,22 +72,29 @@ async def test_streaming_idle_timeout_triggers_on_stall():
         MagicMock(type="response.output_text.delta", delta="never arrives"),
     ]
 
+    stall_cancelled = False
+
     # Create a mock stream that stalls
     class MockStalledStream:
         async def __aiter__(self):
             """Simulate a stream that stalls after 2 chunks."""
+            nonlocal stall_cancelled
             yield mock_events[0]
-            await asyncio.sleep(0.1)
+            await asyncio.sleep(0.01)
             yield mock_events[1]
             # Simulate indefinite stall - no more data
-            await asyncio.sleep(10)  # Much longer than idle timeout
+            try:
+                await asyncio.sleep(10)  # Much longer than idle timeout
+            except asyncio.CancelledError:
+                stall_cancelled = True
+                raise
             yield mock_events[2]  # This should never be reached
 
     # Create provider with very short idle timeout
     provider = OpenAIResponsesProvider(
         model="gpt-5-mini",
         api_key="test-key",
-        idle_timeout=0.5  # 500ms idle timeout
+        idle_timeout=0.05  # 50ms idle timeout
     )
 
     # Mock the client
@@ -106,5 +113,8 @@ async def test_streaming_idle_timeout_triggers_on_stall():
         assert chunks == ["Start ", "text "]
 
         # Verify the error message indicates idle timeout
-        assert "No data received for 0.5s during stream" in str(exc_info.value)
-        assert "connection may be stalled" in str(exc_info.value)
\ No newline at end of file
+        assert "No data received for 0.05s during stream" in str(exc_info.value)
+        assert "connection may be stalled" in str(exc_info.value)
+
+        # The idle timeout cancels the stalled read rather than waiting it out
+        assert stall_cancelled
\ No newline at end of file
@@ -1,6 +1,8 @@
 """Shared fixtures and test data for storage testing."""
 
+import copy
 import hashlib
+from functools import lru_cache
 import pytest
 import tempfile
 import numpy as np
@@ -8,11 +10,13 @@ from pathlib import Path
 from typing import Dict, Any, List
 from nano_graphrag._utils import wrap_embedding_func_with_attrs
 
+_RNG = np.random.default_rng()
+
 
 @wrap_embedding_func_with_attrs(embedding_dim=128, max_token_size=8192)
 async def mock_embedding_func(texts: List[str]) -> np.ndarray:
     """Random embeddings for testing (non-deterministic)."""
-    return np.random.rand(len(texts), 128)
+    return _RNG.random((len(texts), 128))
 
 
 @wrap_embedding_func_with_attrs(embedding_dim=128, max_token_size=8192)
@@ -41,48 +45,54 @@ async def deterministic_embedding_func(texts: List[str]) -> np.ndarray:
             pass
 
     # Fallback: Keyword-based semantic embeddings for predictable tests
-    embeddings = []
-    for text in texts:
-        # Create embedding based on word presence
-        embedding = np.zeros(128)
-        words = text.lower().split()
-
-        # Important keywords for our tests
-        keyword_indices = {
-            'fruit': [0, 10, 20],
-            'apple': [1, 11, 21],
-            'banana': [2, 12, 22],
-            'orange': [3, 13, 23],
-            'citrus': [4, 14, 24],
-            'red': [5, 15, 25],
-            'yellow': [6, 16, 26],
-            'vehicle': [30, 40, 50],
-            'car': [31, 41, 51],
-            'bike': [32, 42, 52],
-            'transport': [33, 43, 53],
-            'eco': [34, 44, 54]
-        }
-
-        # Set values based on keyword presence
-        for word in words:
-            if word in keyword_indices:
-                for idx in keyword_indices[word]:
-                    embedding[idx] = 1.0
-
-        # Add small hash-based variation for uniqueness
-        hash_obj = hashlib.md5(text.encode())
-        seed = int(hash_obj.hexdigest()[:8], 16)
-        np.random.seed(seed)
-        embedding += np.random.rand(128) * 0.1
-
-        # Normalize
-        norm = np.linalg.norm(embedding)
-        if norm > 0:
-            embedding = embedding / norm
-
-        embeddings.append(embedding)
-
-    return np.array(embeddings)
+    if not texts:
+        return np.zeros((0, 128))
+    return np.stack([_keyword_embedding(text) for text in texts])
+
+
+# Important keywords for our tests
+_KEYWORD_INDICES = {
+    'fruit': [0, 10, 20],
+    'apple': [1, 11, 21],
+    'banana': [2, 12, 22],
+    'orange': [3, 13, 23],
+    'citrus': [4, 14, 24],
+    'red': [5, 15, 25],
+    'yellow': [6, 16, 26],
+    'vehicle': [30, 40, 50],
+    'car': [31, 41, 51],
+    'bike': [32, 42, 52],
+    'transport': [33, 43, 53],
+    'eco': [34, 44, 54]
+}
+_KEYWORD_COLUMNS = {word: np.array(indices) for word, indices in _KEYWORD_INDICES.items()}
+
+
+@lru_cache(maxsize=1024)
+def _keyword_embedding(text: str) -> np.ndarray:
+    """Keyword embedding for one text; a pure function of text, so cached.
+
+    The returned array is shared between calls and marked read-only.
+    """
+    # Create embedding based on word presence: one fancy-indexed assignment
+    # over all keyword columns instead of per-index scalar writes
+    embedding = np.zeros(128)
+    columns = [_KEYWORD_COLUMNS[word] for word in text.lower().split() if word in _KEYWORD_COLUMNS]
+    if columns:
+        embedding[np.concatenate(columns)] = 1.0
+
+    # Add small hash-based variation for uniqueness; a private RandomState
+    # gives the same stream as seeding the global one, without clobbering it
+    seed = int.from_bytes(hashlib.blake2b(text.encode(), digest_size=4).digest(), "little")
+    embedding += np.random.RandomState(seed).rand(128) * 0.1
+
+    # Normalize
+    norm = np.linalg.norm(embedding)
+    if norm > 0:
+        embedding = embedding / norm
+
+    embedding.flags.writeable = False
+    return embedding
 
 
 @pytest.fixture
@@ -115,94 +125,98 @@ def mock_global_config(temp_storage_dir) -> Dict[str, Any]:
     }
 
 
-@pytest.fixture
-def standard_test_dataset() -> Dict[str, Any]:
-    """Standard test dataset for all storage types."""
-    return {
-        "vectors": {
-            "vec1": {
-                "content": "apple fruit food",
-                "metadata": {"type": "fruit", "category": "food"}
-            },
-            "vec2": {
-                "content": "banana fruit yellow",
-                "metadata": {"type": "fruit", "category": "food"}
-            },
-            "vec3": {
-                "content": "car vehicle transport",
-                "metadata": {"type": "vehicle", "category": "transport"}
-            },
-            "vec4": {
-                "content": "bike vehicle eco",
-                "metadata": {"type": "vehicle", "category": "transport"}
-            },
-            "vec5": {
-                "content": "orange fruit citrus",
-                "metadata": {"type": "fruit", "category": "food"}
-            }
+# Built once at import; the fixture hands each test its own deep copy
+_STANDARD_TEST_DATASET = {
+    "vectors": {
+        "vec1": {
+            "content": "apple fruit food",
+            "metadata": {"type": "fruit", "category": "food"}
+        },
+        "vec2": {
+            "content": "banana fruit yellow",
+            "metadata": {"type": "fruit", "category": "food"}
         },
-        "nodes": {
-            "person_alice": {
-                "type": "Person",
-                "name": "Alice",
-                "age": "30",
-                "occupation": "Engineer"
-            },
-            "person_bob": {
-                "type": "Person",
-                "name": "Bob",
-                "age": "25",
-                "occupation": "Designer"
-            },
-            "person_charlie": {
-                "type": "Person",
-                "name": "Charlie",
-                "age": "35",
-                "occupation": "Manager"
-            },
-            "org_acme": {
-                "type": "Organization",
-                "name": "ACME Corp",
-                "industry": "Technology"
-            },
-            "org_xyz": {
-                "type": "Organization",
-                "name": "XYZ Inc",
-                "industry": "Finance"
-            }
+        "vec3": {
+            "content": "car vehicle transport",
+            "metadata": {"type": "vehicle", "category": "transport"}
         },
-        "edges": [
-            ("person_alice", "person_bob", {"relation": "knows", "since": "2020"}),
-            ("person_bob", "person_charlie", {"relation": "knows", "since": "2019"}),
-            ("person_alice", "org_acme", {"relation": "works_at", "role": "Senior Engineer"}),
-            ("person_bob", "org_acme", {"relation": "works_at", "role": "Lead Designer"}),
-            ("person_charlie", "org_xyz", {"relation": "works_at", "role": "Product Manager"})
-        ],
-        "kv_data": {
-            "doc_001": {
-                "title": "Document 1",
-                "content": "This is the first test document.",
-                "metadata": {"author": "Alice", "date": "2024-01-01"}
-            },
-            "doc_002": {
-                "title": "Document 2",
-                "content": "This is the second test document.",
-                "metadata": {"author": "Bob", "date": "2024-01-02"}
-            },
-            "chunk_001": {
-                "content": "First chunk of text",
-                "doc_id": "doc_001",
-                "chunk_index": 0
-            },
-            "chunk_002": {
-                "content": "Second chunk of text",
-                "doc_id": "doc_001",
-                "chunk_index": 1
-            },
-            "report_001": {
-                "community_id": "comm_1",
-                "summary": "Community of software engineers",
-                "entities": ["person_alice", "person_bob"]
-            }
+        "vec4": {
+            "content": "bike vehicle eco",
+            "metadata": {"type": "vehicle", "category": "transport"}
+        },
+        "vec5": {
+            "content": "orange fruit citrus",
+            "metadata": {"type": "fruit", "category": "food"}
         }
-    }
\ No newline at end of file
+    },
+    "nodes": {
+        "person_alice": {
+            "type": "Person",
+            "name": "Alice",
+            "age": "30",
+            "occupation": "Engineer"
+        },
+        "person_bob": {
+            "type": "Person",
+            "name": "Bob",
+            "age": "25",
+            "occupation": "Designer"
+        },
+        "person_charlie": {
+            "type": "Person",
+            "name": "Charlie",
+            "age": "35",
+            "occupation": "Manager"
+        },
+        "org_acme": {
+            "type": "Organization",
+            "name": "ACME Corp",
+            "industry": "Technology"
+        },
+        "org_xyz": {
+            "type": "Organization",
+            "name": "XYZ Inc",
+            "industry": "Finance"
+        }
+    },
+    "edges": [
+        ("person_alice", "person_bob", {"relation": "knows", "since": "2020"}),
+        ("person_bob", "person_charlie", {"relation": "knows", "since": "2019"}),
+        ("person_alice", "org_acme", {"relation": "works_at", "role": "Senior Engineer"}),
+        ("person_bob", "org_acme", {"relation": "works_at", "role": "Lead Designer"}),
+        ("person_charlie", "org_xyz", {"relation": "works_at", "role": "Product Manager"})
+    ],
+    "kv_data": {
+        "doc_001": {
+            "title": "Document 1",
+            "content": "This is the first test document.",
+            "metadata": {"author": "Alice", "date": "2024-01-01"}
+        },
+        "doc_002": {
+            "title": "Document 2",
+            "content": "This is the second test document.",
+            "metadata": {"author": "Bob", "date": "2024-01-02"}
+        },
+        "chunk_001": {
+            "content": "First chunk of text",
+            "doc_id": "doc_001",
+            "chunk_index": 0
+        },
+        "chunk_002": {
+            "content": "Second chunk of text",
+            "doc_id": "doc_001",
+            "chunk_index": 1
+        },
+        "report_001": {
+            "community_id": "comm_1",
+            "summary": "Community of software engineers",
+            "entities": ["person_alice", "person_bob"]
+        }
+    }
+}
+
+
+@pytest.fixture
+def standard_test_dataset() -> Dict[str, Any]:
+    """Standard test dataset for all storage types."""
+    return copy.deepcopy(_STANDARD_TEST_DATASET)
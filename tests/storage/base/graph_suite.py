@@ -30,7 +30,11 @@ class BaseGraphStorageTestSuite(ABC):
     @pytest.fixture
     @abstractmethod
     async def storage(self) -> Any:
-        """Provide storage instance for testing."""
+        """Provide storage instance for testing.
+
+        Backends with expensive setup (drivers, indexes) may widen the scope
+        and pair it with an autouse fixture that clears the data per test.
+        """
         pass
 
     @pytest.fixture
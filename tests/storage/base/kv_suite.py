@@ -25,7 +25,11 @@ class BaseKVStorageTestSuite(ABC):
     @pytest.fixture
     @abstractmethod
     async def storage(self) -> Any:
-        """Provide storage instance for testing."""
+        """Provide storage instance for testing.
+
+        Backends with expensive setup may widen the scope and pair it with
+        an autouse fixture that drops the data per test.
+        """
         pass
 
     @pytest.fixture
@@ -17,9 +17,9 @@ pytestmark = pytest.mark.skipif(
 class TestNeo4jIntegration(BaseGraphStorageTestSuite):
     """Neo4j storage integration tests."""
 
-    @pytest_asyncio.fixture
+    @pytest_asyncio.fixture(scope="session")
     async def storage(self):
-        """Provide Neo4j storage instance."""
+        """Provide one Neo4j storage (and driver) shared by every test."""
         config = {
             "addon_params": {
                 "neo4j_url": os.environ.get("NEO4J_URL", "bolt://localhost:7687"),
@@ -37,9 +37,6 @@ class TestNeo4jIntegration(BaseGraphStorageTestSuite):
         }
 
         storage = Neo4jStorage(namespace="test_integration", global_config=config)
-
-        # Clean up before tests
-        await storage._debug_delete_all_node_edges()
         await storage.index_start_callback()
 
         yield storage
@@ -49,6 +46,11 @@ class TestNeo4jIntegration(BaseGraphStorageTestSuite):
         if hasattr(storage, 'async_driver'):
             await storage.async_driver.close()
 
+    @pytest_asyncio.fixture(autouse=True)
+    async def _reset_storage(self, storage):
+        """Start every test from an empty namespace on the shared storage."""
+        await storage._debug_delete_all_node_edges()
+
     @pytest.fixture
     def contract(self):
         """Define Neo4j capabilities."""
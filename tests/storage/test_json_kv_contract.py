@@ -2,7 +2,6 @@
 
 import pytest
 import pytest_asyncio
-from pathlib import Path
 from tests.storage.base import BaseKVStorageTestSuite, KVStorageContract
 from nano_graphrag._storage.kv_json import JsonKVStorage
 
@@ -10,16 +9,13 @@ from nano_graphrag._storage.kv_json import JsonKVStorage
 class TestJsonKVContract(BaseKVStorageTestSuite):
     """JSON KV storage contract tests."""
 
-    @pytest_asyncio.fixture
-    async def storage(self, temp_storage_dir):
-        """Provide JSON KV storage instance."""
+    @pytest_asyncio.fixture(scope="session")
+    async def storage(self, tmp_path_factory):
+        """Provide one JSON KV storage instance shared by every test."""
         config = {
-            "working_dir": str(temp_storage_dir)
+            "working_dir": str(tmp_path_factory.mktemp("json_kv"))
         }
 
-        # Ensure directory exists
-        Path(config["working_dir"]).mkdir(parents=True, exist_ok=True)
-
         storage = JsonKVStorage(
             namespace="test",
             global_config=config
@@ -27,7 +23,12 @@ class TestJsonKVContract(BaseKVStorageTestSuite):
 
         yield storage
 
-        # Cleanup is automatic with temp dir
+        # Cleanup is automatic with tmp_path_factory
+
+    @pytest_asyncio.fixture(autouse=True)
+    async def _reset_storage(self, storage):
+        """Start every test from an empty namespace on the shared storage."""
+        await storage.drop()
 
     @pytest.fixture
     def contract(self):
@@ -238,6 +238,30 @@ class TestQdrantStorage:
                 # Check client.close was called on exit
                 mock_client.close.assert_called_once()
 
+    @pytest.mark.asyncio
+    async def test_check_health_reuses_client(self, mock_embedding_func, mock_global_config):
+        """Test health probe goes through the shared async client."""
+        with patch("nano_graphrag._storage.vdb_qdrant.ensure_dependency"):
+            with patch("qdrant_client.AsyncQdrantClient") as mock_client_class:
+                mock_client = AsyncMock()
+                mock_client_class.return_value = mock_client
+
+                from nano_graphrag._storage.vdb_qdrant import QdrantVectorStorage
+
+                storage = QdrantVectorStorage(
+                    namespace="test",
+                    global_config=mock_global_config,
+                    embedding_func=mock_embedding_func
+                )
+
+                assert await storage.check_health() is True
+                assert await storage.check_health() is True
+                mock_client_class.assert_called_once()
+                assert mock_client.get_collections.await_count == 2
+
+                mock_client.get_collections.side_effect = ConnectionError("down")
+                assert await storage.check_health() is False
+
 
 @pytest.mark.integration
 class TestQdrantIntegration:
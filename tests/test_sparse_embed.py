@@ -54,7 +54,7 @@ async def test_sparse_provider_with_service():
         with patch("httpx.AsyncClient") as mock_client_class:
             mock_client = AsyncMock()
             mock_client.post.return_value = mock_response
-            mock_client_class.return_value.__aenter__.return_value = mock_client
+            mock_client_class.return_value = mock_client
 
             provider = SparseEmbeddingProvider(config=config)
             result = await provider.embed(["text1", "text2"])
@@ -84,7 +84,7 @@ async def test_sparse_provider_service_timeout():
         with patch("httpx.AsyncClient") as mock_client_class:
             mock_client = AsyncMock()
             mock_client.post.side_effect = httpx.TimeoutException("timeout")
-            mock_client_class.return_value.__aenter__.return_value = mock_client
+            mock_client_class.return_value = mock_client
 
             provider = SparseEmbeddingProvider(config=config)
             result = await provider.embed(["test"])
@@ -112,7 +112,7 @@ async def test_sparse_provider_service_error():
             mock_response.raise_for_status.side_effect = httpx.HTTPStatusError(
                 "500", request=None, response=mock_response
             )
-            mock_client_class.return_value.__aenter__.return_value = mock_client
+            mock_client_class.return_value = mock_client
 
             provider = SparseEmbeddingProvider(config=config)
             result = await provider.embed(["test"])
@@ -120,4 +120,115 @@ async def test_sparse_provider_service_error():
             # Should return empty on error
             assert len(result) == 1
             assert result[0]["indices"] == []
-            assert result[0]["values"] == []
\ No newline at end of file
+            assert result[0]["values"] == []
+
+@pytest.mark.asyncio
+async def test_sparse_provider_msgpack_wire_format():
+    """Test sparse provider requests and decodes MessagePack payloads."""
+    msgpack = pytest.importorskip("msgpack")
+    import numpy as np
+
+    config = HybridSearchConfig(enabled=True)
+
+    mock_response = MagicMock()
+    mock_response.content = msgpack.packb([
+        {
+            "i": np.array([1, 10, 100], dtype=np.int32).tobytes(),
+            "v": np.array([0.5, 0.25, 0.125], dtype=np.float32).tobytes()
+        }
+    ], use_bin_type=True)
+    mock_response.raise_for_status = MagicMock()
+
+    env = {"SPARSE_SERVICE_URL": "http://test:8001", "SPARSE_WIRE_FORMAT": "msgpack"}
+    with patch.dict("os.environ", env):
+        with patch("httpx.AsyncClient") as mock_client_class:
+            mock_client = AsyncMock()
+            mock_client.post.return_value = mock_response
+            mock_client_class.return_value = mock_client
+
+            provider = SparseEmbeddingProvider(config=config)
+            result = await provider.embed(["text1"])
+
+            mock_client.post.assert_called_once_with(
+                "http://test:8001/embed",
+                json={"texts": ["text1"]},
+                headers={"Accept": "application/msgpack"}
+            )
+            assert result == [{"indices": [1, 10, 100], "values": [0.5, 0.25, 0.125]}]
+
+
+@pytest.mark.asyncio
+async def test_sparse_provider_msgpack_falls_back_to_json_without_msgpack():
+    """Test sparse provider uses JSON when msgpack is requested but not installed."""
+    config = HybridSearchConfig(enabled=True)
+
+    mock_response = MagicMock()
+    mock_response.json.return_value = {"embeddings": [{"indices": [1], "values": [0.5]}]}
+    mock_response.raise_for_status = MagicMock()
+
+    env = {"SPARSE_SERVICE_URL": "http://test:8001", "SPARSE_WIRE_FORMAT": "msgpack"}
+    with patch.dict("os.environ", env), patch.dict("sys.modules", {"msgpack": None}):
+        with patch("httpx.AsyncClient") as mock_client_class:
+            mock_client = AsyncMock()
+            mock_client.post.return_value = mock_response
+            mock_client_class.return_value = mock_client
+
+            provider = SparseEmbeddingProvider(config=config)
+            result = await provider.embed(["text1"])
+
+            mock_client.post.assert_called_once_with(
+                "http://test:8001/embed",
+                json={"texts": ["text1"]}
+            )
+            assert result == [{"indices": [1], "values": [0.5]}]
+
+
+@pytest.mark.asyncio
+async def test_sparse_provider_reuses_http_client():
+    """Test sparse provider keeps one pooled HTTP client across calls."""
+    config = HybridSearchConfig(enabled=True)
+
+    mock_response = MagicMock()
+    mock_response.json.return_value = {"embeddings": [{"indices": [1], "values": [0.5]}]}
+    mock_response.raise_for_status = MagicMock()
+
+    with patch.dict("os.environ", {"SPARSE_SERVICE_URL": "http://test:8001"}):
+        with patch("httpx.AsyncClient") as mock_client_class:
+            mock_client = AsyncMock()
+            mock_client.post.return_value = mock_response
+            mock_client_class.return_value = mock_client
+
+            provider = SparseEmbeddingProvider(config=config)
+            await provider.embed(["text1"])
+            await provider.embed(["text2"])
+
+            assert mock_client_class.call_count == 1
+            assert mock_client.post.call_count == 2
+
+            await provider.aclose()
+            mock_client.aclose.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_sparse_provider_does_not_retry_client_errors():
+    """Test sparse provider fails fast on non-transient 4xx responses."""
+    import httpx
+
+    config = HybridSearchConfig(enabled=True)
+
+    with patch.dict("os.environ", {"SPARSE_SERVICE_URL": "http://test:8001"}):
+        with patch("httpx.AsyncClient") as mock_client_class:
+            mock_client = AsyncMock()
+            mock_response = MagicMock()
+            mock_response.status_code = 422
+            mock_client.post.return_value = mock_response
+            mock_response.raise_for_status.side_effect = httpx.HTTPStatusError(
+                "422", request=None, response=mock_response
+            )
+            mock_client_class.return_value = mock_client
+
+            provider = SparseEmbeddingProvider(config=config)
+            with pytest.raises(httpx.HTTPStatusError):
+                await provider.embed(["test"])
+
+            assert mock_client.post.call_count == 1
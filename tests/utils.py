@@ -70,6 +70,17 @@ def create_mock_embedding_provider(dimension: int = 1536) -> Mock:
     return provider
 
 
+def aret(value):
+    """Return a plain async stub resolving to ``value``.
+
+    Cheaper than ``AsyncMock(return_value=...)`` for fixtures whose calls
+    are never asserted; keep ``AsyncMock`` wherever call tracking matters.
+    """
+    async def _stub(*args, **kwargs):
+        return value
+    return _stub
+
+
 @wrap_embedding_func_with_attrs(embedding_dim=384, max_token_size=8192)
 async def mock_embedding_func(texts: List[str]) -> np.ndarray:
     """Mock embedding function for tests."""